@@ -0,0 +1,306 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+
+import portalocker
+from utils.read_params import read_params
+
+
+class Blob_Cache:
+    """
+    Description :   This class is used for caching the blob content on local disk. The content is stored under
+                    its sha256 digest and indexed by container and blob name along with the etag, so that the
+                    reads can be revalidated with conditional requests. The least recently used entries are
+                    evicted when the cache grows beyond the configured size. The access times are only updated
+                    in memory on reads, the index is written on insert and on exit. Writes take a lock file
+                    and merge the index on disk first, so that processes sharing the cache dir keep each other's
+                    entries and the size limit holds across them
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
+        self.cache_dir = self.config["blob_cache"]["dir"]
+
+        self.max_size = self.config["blob_cache"]["max_size_mb"] * 1024 * 1024
+
+        self.index_file = os.path.join(self.cache_dir, "index.json")
+
+        self.lock_file = os.path.join(self.cache_dir, "index.lock")
+
+        self.lock_timeout = self.config["blob_cache"]["lock_timeout"]
+
+        self.lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.index = self.load_index()
+
+        self.removed = {}
+
+        self.dirty = False
+
+        atexit.register(self.close)
+
+    def get_key(self, container_name, blob_name):
+        """
+        Method Name :   get_key
+        Description :   This method is used for getting the index key of the blob
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        return container_name + "/" + blob_name
+
+    def get_content_path(self, digest):
+        """
+        Method Name :   get_content_path
+        Description :   This method is used for getting the local path of the content with the digest
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        return os.path.join(self.cache_dir, digest)
+
+    def load_index(self):
+        """
+        Method Name :   load_index
+        Description :   This method is used for loading the cache index from the cache dir
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def merge_index(self):
+        """
+        Method Name :   merge_index
+        Description :   This method is used for merging the cache index on disk into the index in memory, the
+                        most recently accessed entry of every key is kept and the entries removed by this
+                        process are dropped. It must be called with the lock file held
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        index = self.load_index()
+
+        for key, digest in self.removed.items():
+            if key in index and index[key]["digest"] == digest:
+                del index[key]
+
+        for key, entry in self.index.items():
+            if key not in index or entry["last_access"] >= index[key]["last_access"]:
+                index[key] = entry
+
+        self.index, self.removed = index, {}
+
+    def save_index(self):
+        """
+        Method Name :   save_index
+        Description :   This method is used for writing the cache index to the cache dir, it must be called
+                        with the lock file held
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        tmp_file = self.index_file + ".tmp"
+
+        with open(tmp_file, "w") as f:
+            json.dump(self.index, f)
+
+        os.replace(tmp_file, self.index_file)
+
+    def get_etag(self, container_name, blob_name):
+        """
+        Method Name :   get_etag
+        Description :   This method is used for getting the etag of the cached blob
+        Output      :   The etag, or None if the blob is not cached
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            entry = self.index.get(self.get_key(container_name, blob_name))
+
+            if entry is None or not os.path.exists(
+                self.get_content_path(entry["digest"])
+            ):
+                return None
+
+            return entry["etag"]
+
+    def read(self, container_name, blob_name):
+        """
+        Method Name :   read
+        Description :   This method is used for reading the cached content of the blob, the access time is
+                        updated in memory only
+        Output      :   The content, or None if the blob is not cached or its content was removed meanwhile
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.read.__name__
+
+        try:
+            with self.lock:
+                key = self.get_key(container_name, blob_name)
+
+                entry = self.index.get(key)
+
+                if entry is None:
+                    return None
+
+                try:
+                    with open(self.get_content_path(entry["digest"]), "rb") as f:
+                        content = f.read()
+
+                except FileNotFoundError:
+                    self.removed[key] = self.index.pop(key)["digest"]
+
+                    self.dirty = True
+
+                    return None
+
+                entry["last_access"] = time.time()
+
+                self.dirty = True
+
+            return content
+
+        except Exception as e:
+            raise Exception(
+                f"Exception occured in Class : {self.class_name}, Method : {method_name}, Error : {str(e)}"
+            )
+
+    def put(self, container_name, blob_name, etag, content):
+        """
+        Method Name :   put
+        Description :   This method is used for storing the content of the blob along with its etag
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.put.__name__
+
+        try:
+            digest = hashlib.sha256(content).hexdigest()
+
+            content_path = self.get_content_path(digest)
+
+            with self.lock, portalocker.Lock(self.lock_file, timeout=self.lock_timeout):
+                if not os.path.exists(content_path):
+                    tmp_path = content_path + ".tmp"
+
+                    with open(tmp_path, "wb") as f:
+                        f.write(content)
+
+                    os.replace(tmp_path, content_path)
+
+                self.index[self.get_key(container_name, blob_name)] = {
+                    "etag": etag,
+                    "digest": digest,
+                    "size": len(content),
+                    "last_access": time.time(),
+                }
+
+                self.merge_index()
+
+                self.evict()
+
+                self.save_index()
+
+                self.dirty = False
+
+        except Exception as e:
+            raise Exception(
+                f"Exception occured in Class : {self.class_name}, Method : {method_name}, Error : {str(e)}"
+            )
+
+    def evict(self):
+        """
+        Method Name :   evict
+        Description :   This method is used for removing the least recently used entries until the
+                        cached content fits in the configured size, and the content files which no entry
+                        references. It must be called with the lock file held
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        sizes = {entry["digest"]: entry["size"] for entry in self.index.values()}
+
+        total_size = sum(sizes.values())
+
+        lru_keys = sorted(self.index, key=lambda k: self.index[k]["last_access"])
+
+        for key in lru_keys:
+            if total_size <= self.max_size:
+                break
+
+            digest = self.index.pop(key)["digest"]
+
+            if all(entry["digest"] != digest for entry in self.index.values()):
+                total_size -= sizes[digest]
+
+                content_path = self.get_content_path(digest)
+
+                if os.path.exists(content_path):
+                    os.remove(content_path)
+
+        digests = set(entry["digest"] for entry in self.index.values())
+
+        for name in os.listdir(self.cache_dir):
+            if len(name) == 64 and name not in digests:
+                os.remove(self.get_content_path(name))
+
+    def close(self):
+        """
+        Method Name :   close
+        Description :   This method is used for merging and writing the index on exit, when access times
+                        were updated or entries removed since it was last written
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        with self.lock:
+            if self.dirty:
+                with portalocker.Lock(self.lock_file, timeout=self.lock_timeout):
+                    self.merge_index()
+
+                    self.save_index()
+
+                self.dirty = False
+
+
+_blob_cache = None
+
+_blob_cache_lock = threading.Lock()
+
+
+def get_blob_cache():
+    """
+    Method Name :   get_blob_cache
+    Description :   This method is used for getting the process wide blob cache, creating it on first use
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _blob_cache
+
+    with _blob_cache_lock:
+        if _blob_cache is None:
+            _blob_cache = Blob_Cache()
+
+        return _blob_cache
@@ -1,92 +1,67 @@
 import json
 import os
 import pickle
-from io import StringIO
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO, TextIOWrapper
 
+import numpy as np
 import pandas as pd
-from azure.storage.blob import BlobServiceClient, ContainerClient
+import pyarrow as pa
+import pyarrow.parquet as pq
+from phising.blob_storage_operations.blob_cache import get_blob_cache
+from phising.blob_storage_operations.storage_backends import get_storage_backend
 from utils.logger import App_Logger
 from utils.model_utils import Model_Utils
 from utils.read_params import read_params
 
+_background_executor = None
 
-class Blob_Operation:
-    def __init__(self):
-        self.config = read_params()
-
-        self.connection_string = os.environ["AZURE_CONN_STR"]
+_background_executor_lock = threading.Lock()
 
-        self.class_name = self.__class__.__name__
 
-        self.log_writer = App_Logger()
+def get_background_executor():
+    """
+    Method Name :   get_background_executor
+    Description :   This method is used for getting the process wide executor for the uploads which are done
+                    in background, creating it on first use
 
-        self.model_utils = Model_Utils()
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _background_executor
 
-        self.model_save_format = self.config["model_utils"]["save_format"]
+    with _background_executor_lock:
+        if _background_executor is None:
+            config = read_params()
 
-    def get_container_client(self, container_name, db_name, collection_name):
-        method_name = self.get_container_client.__name__
+            _background_executor = ThreadPoolExecutor(
+                max_workers=config["blob_storage"]["background_workers"]
+            )
 
-        self.log_writer.start_log(
-            key="start",
-            class_name=self.class_name,
-            method_name=method_name,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
+        return _background_executor
 
-        try:
-            container_client = ContainerClient.from_connection_string(
-                conn_str=self.connection_string, container_name=container_name
-            )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info="Got container client from connection string",
-            )
+class Blob_Operation:
+    def __init__(self):
+        self.config = read_params()
 
-            self.log_writer.start_log(
-                key="exit",
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.storage = get_storage_backend()
 
-            return container_client
+        self.class_name = self.__class__.__name__
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.log_writer = App_Logger()
 
-    def get_blob_client(self, blob_file_name, container_name, db_name, collection_name):
-        method_name = self.get_blob_client.__name__
+        self.model_utils = Model_Utils()
 
-        try:
-            client = BlobServiceClient.from_connection_string(
-                conn_str=self.connection_string
-            )
+        self.blob_cache = get_blob_cache()
 
-            blob_client = client.get_blob_client(
-                container=container_name, blob=blob_file_name
-            )
+        self.model_save_format = self.config["model_utils"]["save_format"]
 
-            return blob_client
+        self.parquet_ext = ".parquet"
 
-        except Exception as e:
-            self.log_writer.exception_log(
-                error=e,
-                class_name=self.class_name,
-                method_name=method_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+        self.max_concurrency = self.config["blob_storage"]["max_concurrency"]
 
     def create_container(self, container_name, db_name, collection_name):
         method_name = self.create_container.__name__
@@ -100,18 +75,9 @@ class Blob_Operation:
         )
 
         try:
-            client = ContainerClient.from_connection_string(
-                conn_str=self.connection_string,
-                container_name=container_name,
-            )
-
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info="Got container client from connection string",
-            )
+            created = self.storage.create_container(container_name)
 
-            if client.exists() is True:
+            if created is False:
                 self.log_writer.log(
                     db_name=db_name,
                     collection_name=collection_name,
@@ -119,8 +85,6 @@ class Blob_Operation:
                 )
 
             else:
-                client.create_container()
-
                 self.log_writer.log(
                     db_name=db_name,
                     collection_name=collection_name,
@@ -156,13 +120,7 @@ class Blob_Operation:
         )
 
         try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            client.delete_container()
+            self.storage.delete_container(container_name)
 
             self.log_writer.log(
                 db_name=db_name,
@@ -199,20 +157,7 @@ class Blob_Operation:
         )
 
         try:
-            blob_client = self.get_blob_client(
-                blob_file_name=file_name,
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info="Got blob client from blob service client",
-            )
-
-            f = blob_client.exists()
+            f = self.storage.exists(container_name, file_name)
 
             self.log_writer.log(
                 db_name=db_name,
@@ -260,43 +205,9 @@ class Blob_Operation:
         )
 
         try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
             if replace is True:
-                f = self.load_file(
-                    container_name=container_name,
-                    file=container_file_name,
-                    db_name=db_name,
-                    collection_name=collection_name,
-                )
-
-                self.log_writer.log(
-                    db_name=db_name,
-                    collection_name=collection_name,
-                    log_info=f"{container_file_name} file exists is {f}, and replace option is set to {replace}..Deleting the file",
-                )
-
-                if f is True:
-                    self.delete_file(
-                        file_name=container_file_name,
-                        container_name=container_name,
-                        db_name=db_name,
-                        collection_name=collection_name,
-                    )
-
-                else:
-                    self.log_writer.log(
-                        db_name=db_name,
-                        collection_name=collection_name,
-                        log_info=f"{container_file_name} file exists is {f}",
-                    )
-
                 with open(file=local_file_name, mode="rb") as f:
-                    client.upload_blob(data=f, name=container_file_name)
+                    self.storage.put_file(container_name, container_file_name, f)
 
                 self.log_writer.log(
                     db_name=db_name,
@@ -336,8 +247,18 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def delete_file(self, file_name, container_name, db_name, collection_name):
-        method_name = self.delete_file.__name__
+    def upload_data(
+        self, data, container_file_name, container_name, db_name, collection_name
+    ):
+        """
+        Method Name :   upload_data
+        Description :   This method is used for uploading in-memory data or a binary file object to the container,
+                        any existing file with the same name is overwritten in the same request
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.upload_data.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -348,13 +269,50 @@ class Blob_Operation:
         )
 
         try:
-            client = self.get_container_client(
-                container_name=container_name,
+            if isinstance(data, (bytes, bytearray)):
+                size = len(data)
+
+            else:
+                size = data.seek(0, os.SEEK_END) - data.seek(0)
+
+            self.storage.put_file(container_name, container_file_name, data)
+
+            self.log_writer.log(
+                db_name=db_name,
+                collection_name=collection_name,
+                log_info=f"Uploaded {size} bytes to {container_name} container with name as {container_file_name} file",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            client.delete_blob(file_name)
+    def delete_file(self, file_name, container_name, db_name, collection_name):
+        method_name = self.delete_file.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            self.storage.delete_files(container_name, [file_name])
 
             self.log_writer.log(
                 db_name=db_name,
@@ -380,16 +338,19 @@ class Blob_Operation:
             )
 
     def get_object(self, file_name, container_name, db_name, collection_name):
+        """
+        Method Name :   get_object
+        Description :   This method is used for downloading the file from the storage backend as a file object
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
         method_name = self.get_object.__name__
 
         try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+            content, _ = self.storage.get_file(container_name, file_name)
 
-            f = client.download_blob(blob=file_name)
+            f = BytesIO(content)
 
             self.log_writer.log(
                 db_name=db_name,
@@ -430,11 +391,7 @@ class Blob_Operation:
         )
 
         try:
-            func = (
-                lambda: object.readall().decode()
-                if decode is True
-                else object.readall()
-            )
+            func = lambda: object.read().decode() if decode is True else object.read()
 
             self.log_writer.log(
                 db_name=db_name,
@@ -463,8 +420,19 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def read_text(self, file_name, container_name, db_name, collection_name):
-        method_name = self.read_text.__name__
+    def read_blob(
+        self, file_name, container_name, db_name, collection_name, use_cache=True
+    ):
+        """
+        Method Name :   read_blob
+        Description :   This method is used for reading the content of the blob as bytes. When use_cache is set,
+                        the local cached copy is revalidated with a conditional request on its etag and the blob
+                        is only downloaded if it changed, or if its cached content was evicted meanwhile
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.read_blob.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -475,17 +443,89 @@ class Blob_Operation:
         )
 
         try:
-            f_obj = self.get_object(
-                container_name=container_name,
-                local_file_name=file_name,
+            etag = None
+
+            if use_cache is True and self.storage.remote is True:
+                etag = self.blob_cache.get_etag(
+                    container_name=container_name, blob_name=file_name
+                )
+
+            content, new_etag = self.storage.get_file(
+                container_name, file_name, etag=etag
+            )
+
+            is_cached = content is None
+
+            if is_cached:
+                content = self.blob_cache.read(
+                    container_name=container_name, blob_name=file_name
+                )
+
+                if content is None:
+                    is_cached = False
+
+                    content, new_etag = self.storage.get_file(container_name, file_name)
+
+            if is_cached:
+                self.log_writer.log(
+                    db_name=db_name,
+                    collection_name=collection_name,
+                    log_info=f"{file_name} file from {container_name} container is not modified, read from cache",
+                )
+
+            else:
+                if use_cache is True and self.storage.remote is True:
+                    self.blob_cache.put(
+                        container_name=container_name,
+                        blob_name=file_name,
+                        etag=new_etag,
+                        content=content,
+                    )
+
+                self.log_writer.log(
+                    db_name=db_name,
+                    collection_name=collection_name,
+                    log_info=f"Downloaded {file_name} file from {container_name} container",
+                )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            content = self.read_object(
-                object=f_obj, db_name=db_name, collection_name=collection_name
+            return content
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
             )
 
+    def read_text(self, file_name, container_name, db_name, collection_name):
+        method_name = self.read_text.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            content = self.read_blob(
+                file_name=file_name,
+                container_name=container_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            ).decode()
+
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
@@ -517,17 +557,13 @@ class Blob_Operation:
         )
 
         try:
-            f_obj = self.get_object(
+            json_content = self.read_blob(
+                file_name=file_name,
                 container_name=container_name,
-                local_file_name=file_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            json_content = self.read_object(
-                object=f_obj, db_name=db_name, collection_name=collection_name
-            )
-
             dic = json.loads(json_content)
 
             self.log_writer.log(
@@ -615,17 +651,9 @@ class Blob_Operation:
         )
 
         try:
-            client = self.get_container_client(
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
             folder = folder_name + "/"
 
-            blob_list = client.list_blobs(name_starts_with=folder)
-
-            f_name_lst = [f.name for f in blob_list]
+            f_name_lst = self.storage.list_files(container_name, folder)
 
             self.log_writer.log(
                 db_name=db_name,
@@ -652,10 +680,18 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def read_csv_from_folder(
+    def get_files_with_etags_from_folder(
         self, folder_name, container_name, db_name, collection_name
     ):
-        method_name = self.read_csv_from_folder.__name__
+        """
+        Method Name :   get_files_with_etags_from_folder
+        Description :   This method is used for listing the files of the folder along with their etags
+        Output      :   List of (file name, etag) tuples
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.get_files_with_etags_from_folder.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -664,32 +700,16 @@ class Blob_Operation:
             db_name=db_name,
             collection_name=collection_name,
         )
+
         try:
-            files = self.get_files_from_folder(
-                folder_name=folder_name,
-                container_name=container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+            folder = folder_name + "/"
 
-            lst = [
-                (
-                    self.read_csv(
-                        file_name=f,
-                        container_name=container_name,
-                        db_name=db_name,
-                        collection_name=collection_name,
-                    ),
-                    f,
-                    f.split("/")[-1],
-                )
-                for f in files
-            ]
+            f_lst = self.storage.list_files_with_etags(container_name, folder)
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Read csv files from {folder_name} folder from {container_name} container",
+                log_info=f"Got {len(f_lst)} files with etags from {folder_name} folder from {container_name} container",
             )
 
             self.log_writer.start_log(
@@ -700,7 +720,7 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-            return lst
+            return f_lst
 
         except Exception as e:
             self.log_writer.exception_log(
@@ -711,8 +731,10 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def read_csv(self, file_name, container_name, db_name, collection_name):
-        method_name = self.read_csv.__name__
+    def read_csv_from_folder(
+        self, folder_name, container_name, db_name, collection_name
+    ):
+        method_name = self.read_csv_from_folder.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -721,23 +743,25 @@ class Blob_Operation:
             db_name=db_name,
             collection_name=collection_name,
         )
-
         try:
-            csv_obj = self.get_object(
-                file_name=file_name,
+            files = self.get_files_from_folder(
+                folder_name=folder_name,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            df = self.get_df_from_object(
-                object=csv_obj, db_name=db_name, collection_name=collection_name
+            lst = self.read_csv_files(
+                files=files,
+                container_name=container_name,
+                db_name=db_name,
+                collection_name=collection_name,
             )
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Read {file_name} csv file from {container_name} container",
+                log_info=f"Read {len(lst)} csv files from {folder_name} folder from {container_name} container",
             )
 
             self.log_writer.start_log(
@@ -748,7 +772,7 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-            return df
+            return lst
 
         except Exception as e:
             self.log_writer.exception_log(
@@ -759,8 +783,16 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def get_blob_url(self, file_name, container_name, db_name, collection_name):
-        method_name = self.get_blob_url.__name__
+    def read_csv_files(self, files, container_name, db_name, collection_name):
+        """
+        Method Name :   read_csv_files
+        Description :   This method is used for reading the csv files of the container in parallel
+        Output      :   List of (dataframe, file, file name) tuples in the order of the files
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.read_csv_files.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -771,25 +803,23 @@ class Blob_Operation:
         )
 
         try:
-            blob_client = self.get_blob_client(
-                blob_file_name=file_name,
+            read_func = lambda f: self.read_csv(
+                file_name=f,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
+                use_cache=False,
             )
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Got {file_name} blob from {container_name} container",
-            )
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                dfs = executor.map(read_func, files)
 
-            f = blob_client.url
+                lst = [(df, f, f.split("/")[-1]) for df, f in zip(dfs, files)]
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Got {file_name} blob url",
+                log_info=f"Read {len(lst)} csv files from {container_name} container with {self.max_concurrency} workers",
             )
 
             self.log_writer.start_log(
@@ -800,7 +830,7 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-            return f
+            return lst
 
         except Exception as e:
             self.log_writer.exception_log(
@@ -811,9 +841,206 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-    def copy_data(
-        self,
-        from_file_name,
+    def read_csv(
+        self, file_name, container_name, db_name, collection_name, use_cache=True
+    ):
+        method_name = self.read_csv.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            content = self.read_blob(
+                file_name=file_name,
+                container_name=container_name,
+                db_name=db_name,
+                collection_name=collection_name,
+                use_cache=use_cache,
+            )
+
+            df = pd.read_csv(BytesIO(content))
+
+            self.log_writer.log(
+                db_name=db_name,
+                collection_name=collection_name,
+                log_info=f"Read {file_name} csv file from {container_name} container",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+            return df
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+    def get_blob_url(self, file_name, container_name, db_name, collection_name):
+        method_name = self.get_blob_url.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            f = self.storage.get_url(container_name, file_name)
+
+            self.log_writer.log(
+                db_name=db_name,
+                collection_name=collection_name,
+                log_info=f"Got {file_name} blob url",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+            return f
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+    def copy_files(
+        self, files, from_container_name, to_container_name, db_name, collection_name
+    ):
+        """
+        Method Name :   copy_files
+        Description :   This method is used for copying a list of (from_file_name, to_file_name) pairs between
+                        containers, the copies are submitted concurrently and the pending copies are polled
+                        together until they complete or the copy timeout is reached
+        Output      :   List of (from_file_name, to_file_name) pairs whose copy succeeded
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.copy_files.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            copied, pending = self.storage.copy_files(
+                files=files,
+                from_container_name=from_container_name,
+                to_container_name=to_container_name,
+            )
+
+            self.log_writer.log(
+                db_name=db_name,
+                collection_name=collection_name,
+                log_info=f"Copied {len(copied)} of {len(files)} files from {from_container_name} container to {to_container_name} container, {len(pending)} copies still pending",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+            return copied
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+    def move_files(
+        self, files, from_container_name, to_container_name, db_name, collection_name
+    ):
+        """
+        Method Name :   move_files
+        Description :   This method is used for moving a list of (from_file_name, to_file_name) pairs between
+                        containers, only the source files whose copy succeeded are deleted
+        Output      :   List of (from_file_name, to_file_name) pairs which were moved
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.move_files.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            copied = self.storage.move_files(
+                files=files,
+                from_container_name=from_container_name,
+                to_container_name=to_container_name,
+            )
+
+            self.log_writer.log(
+                db_name=db_name,
+                collection_name=collection_name,
+                log_info=f"Moved {len(copied)} of {len(files)} files from {from_container_name} container to {to_container_name} container",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+            return copied
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+    def copy_data(
+        self,
+        from_file_name,
         from_container_name,
         to_file_name,
         to_container_name,
@@ -831,22 +1058,18 @@ class Blob_Operation:
         )
 
         try:
-            dest_client = self.get_container_client(
-                container_name=to_container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
-
-            from_blob = self.get_blob_url(
-                container_name=from_container_name,
-                local_file_name=from_file_name,
+            copied = self.copy_files(
+                files=[(from_file_name, to_file_name)],
+                from_container_name=from_container_name,
+                to_container_name=to_container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            to_blob = dest_client.get_blob_client(blob=to_file_name)
-
-            to_blob.start_copy_from_url(from_blob)
+            if len(copied) == 0:
+                raise Exception(
+                    f"Copy of {from_file_name} file from {from_container_name} container did not succeed"
+                )
 
             self.log_writer.log(
                 db_name=db_name,
@@ -891,21 +1114,18 @@ class Blob_Operation:
         )
 
         try:
-            self.copy_data(
-                from_file_name=from_file_name,
+            moved = self.move_files(
+                files=[(from_file_name, to_file_name)],
                 from_container_name=from_container_name,
-                to_file_name=to_file_name,
                 to_container_name=to_container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            self.delete_file(
-                file_name=from_file_name,
-                container_name=from_container_name,
-                db_name=db_name,
-                collection_name=collection_name,
-            )
+            if len(moved) == 0:
+                raise Exception(
+                    f"Copy of {from_file_name} file from {from_container_name} container did not succeed, source file is kept"
+                )
 
             self.log_writer.log(
                 db_name=db_name,
@@ -958,20 +1178,13 @@ class Blob_Operation:
                 log_info=f"Got {model_file} as model file",
             )
 
-            f_obj = self.get_object(
+            model_content = self.read_blob(
                 file_name=model_file,
                 container_name=container_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
-            model_content = self.read_object(
-                object=f_obj,
-                db_name=db_name,
-                collection_name=collection_name,
-                decode=False,
-            )
-
             model = pickle.loads(model_content)
 
             self.log_writer.log(
@@ -1019,18 +1232,12 @@ class Blob_Operation:
 
             func = (
                 lambda: model_name + self.model_save_format
-                if model_name == "KMeans"
+                if idx is None
                 else model_name + str(idx) + self.model_save_format
             )
 
             model_file = func()
 
-            self.log_writer.log(
-                db_name=db_name,
-                collection_name=collection_name,
-                log_info=f"Local copy of {model_name} model file name is created",
-            )
-
             dir_func = (
                 lambda: model_dir + "/" + model_file
                 if model_dir is not None
@@ -1045,23 +1252,59 @@ class Blob_Operation:
                 log_info=f"Container location of {model_name} model file name is created ",
             )
 
-            with open(file=model_file, mode="wb") as f:
-                pickle.dump(model, f)
+            self.upload_data(
+                data=pickle.dumps(model),
+                container_file_name=container_model_file,
+                container_name=container_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
 
-            self.log_writer.log(
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Saved local copy of {model_name} model",
             )
 
-            self.upload_file(
-                local_file_name=model_file,
-                container_file_name=container_model_file,
-                container_name=container_name,
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
                 db_name=db_name,
                 collection_name=collection_name,
             )
 
+    def delete_files(self, files, container_name, db_name, collection_name):
+        """
+        Method Name :   delete_files
+        Description :   This method is used for deleting a list of files from the container with the blob batch api,
+                        the files are split in batches of delete_batch_size and the batches are sent in parallel
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.delete_files.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            num_batches = self.storage.delete_files(container_name, files)
+
+            self.log_writer.log(
+                db_name=db_name,
+                collection_name=collection_name,
+                log_info=f"Deleted {len(files)} files from {container_name} container in {num_batches} requests",
+            )
+
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
@@ -1098,18 +1341,17 @@ class Blob_Operation:
                 collection_name=collection_name,
             )
 
-            for f in files:
-                self.delete_file(
-                    file_name=f,
-                    container_name=container_name,
-                    db_name=db_name,
-                    collection_name=collection_name,
-                )
+            self.delete_files(
+                files=files,
+                container_name=container_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"{folder_name} folder is deleted from {container_name} container",
+                log_info=f"{folder_name} folder with {len(files)} files is deleted from {container_name} container",
             )
 
             self.log_writer.start_log(
@@ -1132,7 +1374,6 @@ class Blob_Operation:
     def upload_df_as_csv(
         self,
         dataframe,
-        local_file_name,
         container_file_name,
         container_name,
         db_name,
@@ -1149,16 +1390,16 @@ class Blob_Operation:
         )
 
         try:
-            dataframe.to_csv(local_file_name, index=None, header=True)
+            content = dataframe.to_csv(index=None, header=True).encode()
 
             self.log_writer.log(
                 db_name=db_name,
                 collection_name=collection_name,
-                log_info=f"Created a local copy of dataframe with name {local_file_name}",
+                log_info=f"Serialized dataframe to csv in memory for {container_file_name} file",
             )
 
-            self.upload_file(
-                local_file_name=local_file_name,
+            self.upload_data(
+                data=content,
                 container_file_name=container_file_name,
                 container_name=container_name,
                 db_name=db_name,
@@ -1181,3 +1422,253 @@ class Blob_Operation:
                 db_name=db_name,
                 collection_name=collection_name,
             )
+
+    def upload_df_as_csv_in_background(
+        self,
+        dataframe,
+        container_file_name,
+        container_name,
+        db_name,
+        collection_name,
+    ):
+        """
+        Method Name :   upload_df_as_csv_in_background
+        Description :   This method is used for uploading the dataframe as csv on the background executor, the
+                        caller does not wait for the upload and the failures are logged by upload_df_as_csv
+        Output      :   Future of the upload
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        future = get_background_executor().submit(
+            self.upload_df_as_csv,
+            dataframe=dataframe,
+            container_file_name=container_file_name,
+            container_name=container_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        self.log_writer.log(
+            db_name=db_name,
+            collection_name=collection_name,
+            log_info=f"Submitted upload of {container_file_name} file to background executor",
+        )
+
+        return future
+
+    def get_parquet_schema(self, dataframe, dtypes):
+        """
+        Method Name :   get_parquet_schema
+        Description :   This method is used for building the parquet schema of an export, the columns declared
+                        in dtypes get their declared dtype and the other columns of the dataframe keep the type
+                        inferred from it, columns without any value are stored as strings
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        fields = [
+            (col, pa.from_numpy_dtype(np.dtype(dtype)))
+            for col, dtype in dtypes.items()
+        ]
+
+        for col in dataframe.columns:
+            if col not in dtypes:
+                table = pa.Table.from_pandas(dataframe[[col]], preserve_index=False)
+
+                col_type = table.schema.field(col).type
+
+                if pa.types.is_null(col_type):
+                    col_type = pa.string()
+
+                fields.append((col, col_type))
+
+        return pa.schema(fields)
+
+    def upload_df_in_batches(
+        self,
+        dataframes,
+        dtypes,
+        container_file_name,
+        container_name,
+        db_name,
+        collection_name,
+    ):
+        """
+        Method Name :   upload_df_in_batches
+        Description :   This method is used for uploading an iterable of dataframes as one file in the format given
+                        by the file extension. Every dataframe is appended to a local temporary file as soon as it
+                        is received, so only one batch is held in memory, and the file is uploaded as a stream.
+                        For .parquet files the declared columns of dtypes, the column to dtype mapping of the
+                        schema file, are converted to numbers and written with their declared dtype in every batch.
+                        The other columns keep the type inferred from the first batch, and a column which is not
+                        in the first batch raises
+        Output      :   Number of rows uploaded
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.upload_df_in_batches.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            n_rows, n_batches = 0, 0
+
+            with tempfile.TemporaryFile() as f:
+                if container_file_name.endswith(self.parquet_ext):
+                    writer = None
+
+                    for df in dataframes:
+                        if writer is None:
+                            schema = self.get_parquet_schema(df, dtypes)
+
+                            writer = pq.ParquetWriter(f, schema)
+
+                        new_cols = [c for c in df.columns if c not in schema.names]
+
+                        if len(new_cols) > 0:
+                            raise Exception(
+                                f"Columns {new_cols} are not declared and not in the first batch"
+                            )
+
+                        batch = df.reindex(columns=schema.names)
+
+                        declared_cols = [c for c in schema.names if c in dtypes]
+
+                        batch[declared_cols] = batch[declared_cols].apply(
+                            pd.to_numeric, errors="coerce"
+                        )
+
+                        table = pa.Table.from_pandas(
+                            batch, schema=schema, preserve_index=False
+                        )
+
+                        writer.write_table(table)
+
+                        n_rows, n_batches = n_rows + len(df), n_batches + 1
+
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            f, self.get_parquet_schema(pd.DataFrame(), dtypes)
+                        )
+
+                    writer.close()
+
+                else:
+                    text_f = TextIOWrapper(f, encoding="utf-8", newline="")
+
+                    for df in dataframes:
+                        df.to_csv(text_f, index=False, header=n_batches == 0)
+
+                        n_rows, n_batches = n_rows + len(df), n_batches + 1
+
+                    text_f.flush()
+
+                    text_f.detach()
+
+                self.log_writer.log(
+                    db_name=db_name,
+                    collection_name=collection_name,
+                    log_info=f"Wrote {n_rows} rows in {n_batches} batches for {container_file_name} file",
+                )
+
+                self.upload_data(
+                    data=f,
+                    container_file_name=container_file_name,
+                    container_name=container_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+            return n_rows
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+    def read_df(
+        self, file_name, container_name, db_name, collection_name, use_cache=True
+    ):
+        """
+        Method Name :   read_df
+        Description :   This method is used for reading the dataframe in the format given by the file extension,
+                        .parquet files are read as parquet, other files are read as csv
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.read_df.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=db_name,
+            collection_name=collection_name,
+        )
+
+        try:
+            if file_name.endswith(self.parquet_ext):
+                content = self.read_blob(
+                    file_name=file_name,
+                    container_name=container_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                    use_cache=use_cache,
+                )
+
+                df = pd.read_parquet(BytesIO(content))
+
+                self.log_writer.log(
+                    db_name=db_name,
+                    collection_name=collection_name,
+                    log_info=f"Read {file_name} parquet file from {container_name} container",
+                )
+
+            else:
+                df = self.read_csv(
+                    file_name=file_name,
+                    container_name=container_name,
+                    db_name=db_name,
+                    collection_name=collection_name,
+                    use_cache=use_cache,
+                )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
+
+            return df
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=db_name,
+                collection_name=collection_name,
+            )
@@ -0,0 +1,554 @@
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotModifiedError
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient
+from requests.adapters import HTTPAdapter
+from utils.read_params import read_params
+
+_service_clients = {}
+
+_container_clients = {}
+
+_blob_clients_lock = threading.Lock()
+
+
+def get_service_client(connection_string, max_connections):
+    """
+    Method Name :   get_service_client
+    Description :   This method is used for getting the process wide BlobServiceClient for the connection string,
+                    built on one requests session so that all the blob calls reuse keep-alive connections
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    with _blob_clients_lock:
+        if connection_string not in _service_clients:
+            session = requests.Session()
+
+            adapter = HTTPAdapter(
+                pool_connections=max_connections, pool_maxsize=max_connections
+            )
+
+            session.mount("https://", adapter)
+
+            session.mount("http://", adapter)
+
+            transport = RequestsTransport(session=session, session_owner=False)
+
+            service_client = BlobServiceClient.from_connection_string(
+                conn_str=connection_string, transport=transport
+            )
+
+            _service_clients[connection_string] = service_client
+
+        return _service_clients[connection_string]
+
+
+def get_shared_container_client(connection_string, container_name, max_connections):
+    """
+    Method Name :   get_shared_container_client
+    Description :   This method is used for getting the cached ContainerClient for the container,
+                    which shares the transport of the process wide BlobServiceClient
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    key = (connection_string, container_name)
+
+    client = _container_clients.get(key)
+
+    if client is None:
+        service_client = get_service_client(
+            connection_string=connection_string, max_connections=max_connections
+        )
+
+        with _blob_clients_lock:
+            client = _container_clients.setdefault(
+                key, service_client.get_container_client(container=container_name)
+            )
+
+    return client
+
+
+class Storage_Backend(ABC):
+    """
+    Description :   This class is the interface of the storage used by Blob_Operation. Files are addressed by
+                    container name and a "/" separated file name
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    remote = True
+
+    @abstractmethod
+    def create_container(self, container_name):
+        pass
+
+    @abstractmethod
+    def delete_container(self, container_name):
+        pass
+
+    @abstractmethod
+    def list_files(self, container_name, prefix):
+        pass
+
+    @abstractmethod
+    def list_files_with_etags(self, container_name, prefix):
+        pass
+
+    @abstractmethod
+    def exists(self, container_name, file_name):
+        pass
+
+    @abstractmethod
+    def get_file(self, container_name, file_name, etag=None):
+        pass
+
+    @abstractmethod
+    def put_file(self, container_name, file_name, data):
+        pass
+
+    @abstractmethod
+    def copy_files(self, files, from_container_name, to_container_name):
+        pass
+
+    @abstractmethod
+    def move_files(self, files, from_container_name, to_container_name):
+        pass
+
+    @abstractmethod
+    def delete_files(self, container_name, files):
+        pass
+
+    @abstractmethod
+    def get_url(self, container_name, file_name):
+        pass
+
+
+class Azure_Storage_Backend(Storage_Backend):
+    """
+    Description :   This class is used for storing the files in Azure Blob Storage
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    remote = True
+
+    def __init__(self, connection_string):
+        self.config = read_params()
+
+        self.connection_string = connection_string
+
+        self.max_connections = self.config["blob_storage"]["max_connections"]
+
+        self.max_concurrency = self.config["blob_storage"]["max_concurrency"]
+
+        self.copy_poll_interval = self.config["blob_storage"]["copy_poll_interval"]
+
+        self.copy_timeout = self.config["blob_storage"]["copy_timeout"]
+
+        self.delete_batch_size = self.config["blob_storage"]["delete_batch_size"]
+
+    def get_container_client(self, container_name):
+        return get_shared_container_client(
+            connection_string=self.connection_string,
+            container_name=container_name,
+            max_connections=self.max_connections,
+        )
+
+    def create_container(self, container_name):
+        """
+        Method Name :   create_container
+        Description :   This method is used for creating the container if it does not exist
+        Output      :   True if the container was created, False if it already existed
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        client = self.get_container_client(container_name)
+
+        if client.exists() is True:
+            return False
+
+        client.create_container()
+
+        return True
+
+    def delete_container(self, container_name):
+        self.get_container_client(container_name).delete_container()
+
+    def list_files(self, container_name, prefix):
+        client = self.get_container_client(container_name)
+
+        return [f.name for f in client.list_blobs(name_starts_with=prefix)]
+
+    def list_files_with_etags(self, container_name, prefix):
+        client = self.get_container_client(container_name)
+
+        return [(f.name, f.etag) for f in client.list_blobs(name_starts_with=prefix)]
+
+    def exists(self, container_name, file_name):
+        client = self.get_container_client(container_name)
+
+        return client.get_blob_client(blob=file_name).exists()
+
+    def get_file(self, container_name, file_name, etag=None):
+        """
+        Method Name :   get_file
+        Description :   This method is used for downloading the file, when etag is given the download is
+                        conditional on the file having changed
+        Output      :   (content, etag) tuple, content is None when the file is not modified
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        blob_client = self.get_container_client(container_name).get_blob_client(
+            blob=file_name
+        )
+
+        try:
+            if etag is None:
+                downloader = blob_client.download_blob()
+
+            else:
+                downloader = blob_client.download_blob(
+                    etag=etag, match_condition=MatchConditions.IfModified
+                )
+
+            return downloader.readall(), downloader.properties.etag
+
+        except ResourceNotModifiedError:
+            return None, etag
+
+    def put_file(self, container_name, file_name, data):
+        client = self.get_container_client(container_name)
+
+        client.upload_blob(name=file_name, data=data, overwrite=True)
+
+    def copy_files(self, files, from_container_name, to_container_name):
+        """
+        Method Name :   copy_files
+        Description :   This method is used for copying (from_file_name, to_file_name) pairs, the copies are
+                        submitted concurrently and the pending copies are polled together until they complete
+                        or the copy timeout is reached
+        Output      :   (copied, pending) lists of (from_file_name, to_file_name) pairs
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        src_client = self.get_container_client(from_container_name)
+
+        dest_client = self.get_container_client(to_container_name)
+
+        copy_func = lambda f: (
+            f,
+            dest_client.get_blob_client(blob=f[1]).start_copy_from_url(
+                src_client.get_blob_client(blob=f[0]).url
+            )["copy_status"],
+        )
+
+        status_func = lambda f: (
+            f,
+            dest_client.get_blob_client(blob=f[1]).get_blob_properties().copy.status,
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            copy_status = dict(executor.map(copy_func, files))
+
+            pending = [f for f in copy_status if copy_status[f] == "pending"]
+
+            waited = 0
+
+            while len(pending) > 0 and waited < self.copy_timeout:
+                time.sleep(self.copy_poll_interval)
+
+                waited += self.copy_poll_interval
+
+                copy_status.update(executor.map(status_func, pending))
+
+                pending = [f for f in pending if copy_status[f] == "pending"]
+
+        copied = [f for f in copy_status if copy_status[f] == "success"]
+
+        return copied, pending
+
+    def move_files(self, files, from_container_name, to_container_name):
+        """
+        Method Name :   move_files
+        Description :   This method is used for moving (from_file_name, to_file_name) pairs, only the source
+                        files whose copy succeeded are deleted
+        Output      :   List of (from_file_name, to_file_name) pairs which were moved
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        copied, _ = self.copy_files(
+            files=files,
+            from_container_name=from_container_name,
+            to_container_name=to_container_name,
+        )
+
+        self.delete_files(
+            container_name=from_container_name, files=[f[0] for f in copied]
+        )
+
+        return copied
+
+    def delete_files(self, container_name, files):
+        """
+        Method Name :   delete_files
+        Description :   This method is used for deleting the files with the blob batch api, the files are split
+                        in batches of delete_batch_size and the batches are sent in parallel
+        Output      :   Number of batch requests sent
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        client = self.get_container_client(container_name)
+
+        batches = [
+            files[i : i + self.delete_batch_size]
+            for i in range(0, len(files), self.delete_batch_size)
+        ]
+
+        delete_func = lambda batch: client.delete_blobs(*batch)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            list(executor.map(delete_func, batches))
+
+        return len(batches)
+
+    def get_url(self, container_name, file_name):
+        client = self.get_container_client(container_name)
+
+        return client.get_blob_client(blob=file_name).url
+
+
+class Local_Storage_Backend(Storage_Backend):
+    """
+    Description :   This class is used for storing the files in a local directory, every container is a sub
+                    directory. Writes go through a uniquely named temporary file in the destination directory
+                    and os.replace, so copies can be hardlinks and moves are renames. The temporary files are
+                    not listed
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    remote = False
+
+    tmp_prefix = ".tmp-"
+
+    def __init__(self, root_dir):
+        self.root_dir = os.path.abspath(root_dir)
+
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def get_path(self, container_name, file_name=""):
+        return os.path.join(self.root_dir, container_name, *file_name.split("/"))
+
+    def get_tmp_path(self, path):
+        """
+        Method Name :   get_tmp_path
+        Description :   This method is used for reserving a unique temporary file next to the path, so that
+                        concurrent writers of the same file do not share it
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=self.tmp_prefix, suffix=".tmp"
+        )
+
+        os.close(fd)
+
+        return tmp_path
+
+    def create_container(self, container_name):
+        path = self.get_path(container_name)
+
+        if os.path.isdir(path):
+            return False
+
+        os.makedirs(path)
+
+        return True
+
+    def delete_container(self, container_name):
+        shutil.rmtree(self.get_path(container_name))
+
+    def list_files(self, container_name, prefix):
+        container_path = self.get_path(container_name)
+
+        files = []
+
+        for dir_path, _, file_names in os.walk(container_path):
+            for file_name in file_names:
+                if file_name.startswith(self.tmp_prefix):
+                    continue
+
+                rel_path = os.path.relpath(
+                    os.path.join(dir_path, file_name), container_path
+                )
+
+                name = Path(rel_path).as_posix()
+
+                if name.startswith(prefix):
+                    files.append(name)
+
+        return sorted(files)
+
+    def list_files_with_etags(self, container_name, prefix):
+        return [
+            (f, self.get_etag(os.stat(self.get_path(container_name, f))))
+            for f in self.list_files(container_name, prefix)
+        ]
+
+    def get_etag(self, st):
+        return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    def exists(self, container_name, file_name):
+        return os.path.isfile(self.get_path(container_name, file_name))
+
+    def get_file(self, container_name, file_name, etag=None):
+        """
+        Method Name :   get_file
+        Description :   This method is used for reading the file with a memory map, the etag is built from
+                        the modification time and size of the file
+        Output      :   (content, etag) tuple, content is None when the etag matches
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        path = self.get_path(container_name, file_name)
+
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+
+            file_etag = self.get_etag(st)
+
+            if etag == file_etag:
+                return None, file_etag
+
+            if st.st_size == 0:
+                return b"", file_etag
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                return m.read(), file_etag
+
+    def put_file(self, container_name, file_name, data):
+        path = self.get_path(container_name, file_name)
+
+        tmp_path = self.get_tmp_path(path)
+
+        with open(tmp_path, "wb") as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+
+            else:
+                shutil.copyfileobj(data, f)
+
+        os.replace(tmp_path, path)
+
+    def copy_files(self, files, from_container_name, to_container_name):
+        """
+        Method Name :   copy_files
+        Description :   This method is used for copying (from_file_name, to_file_name) pairs as hardlinks,
+                        falling back to a file copy across file systems
+        Output      :   (copied, pending) lists of (from_file_name, to_file_name) pairs
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        for from_file_name, to_file_name in files:
+            src = self.get_path(from_container_name, from_file_name)
+
+            dest = self.get_path(to_container_name, to_file_name)
+
+            tmp_dest = self.get_tmp_path(dest)
+
+            os.remove(tmp_dest)
+
+            try:
+                os.link(src, tmp_dest)
+
+            except OSError:
+                shutil.copyfile(src, tmp_dest)
+
+            os.replace(tmp_dest, dest)
+
+        return list(files), []
+
+    def move_files(self, files, from_container_name, to_container_name):
+        for from_file_name, to_file_name in files:
+            src = self.get_path(from_container_name, from_file_name)
+
+            dest = self.get_path(to_container_name, to_file_name)
+
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+            os.replace(src, dest)
+
+        return list(files)
+
+    def delete_files(self, container_name, files):
+        for file_name in files:
+            os.remove(self.get_path(container_name, file_name))
+
+        return len(files)
+
+    def get_url(self, container_name, file_name):
+        return Path(self.get_path(container_name, file_name)).as_uri()
+
+
+_storage_backend = None
+
+_storage_backend_lock = threading.Lock()
+
+
+def get_storage_backend():
+    """
+    Method Name :   get_storage_backend
+    Description :   This method is used for getting the process wide storage backend selected by
+                    storage.backend in params.yaml, creating it on first use
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _storage_backend
+
+    with _storage_backend_lock:
+        if _storage_backend is None:
+            config = read_params()
+
+            backend = config["storage"]["backend"]
+
+            if backend == "azure":
+                _storage_backend = Azure_Storage_Backend(
+                    connection_string=os.environ["AZURE_CONN_STR"]
+                )
+
+            elif backend == "local":
+                _storage_backend = Local_Storage_Backend(
+                    root_dir=config["storage"]["local_dir"]
+                )
+
+            else:
+                raise Exception(f"Unknown storage backend : {backend}")
+
+        return _storage_backend
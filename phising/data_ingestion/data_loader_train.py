@@ -1,4 +1,5 @@
 from phising.blob_storage_operations.blob_operations import Blob_Operation
+from utils.dtype_utils import get_schema_dtypes, to_storage_dtypes
 from utils.logger import App_Logger
 from utils.read_params import read_params
 
@@ -17,7 +18,9 @@ class Data_Getter_Train:
 
         self.collection_name = collection_name
 
-        self.train_csv_file = self.config["export_csv_file"]["train"]
+        self.train_file = self.config["export_file"]["train"]
+
+        self.schema_file = self.config["schema_file"]["train_schema_file"]
 
         self.input_files_container = self.config["container"]["input_files"]
 
@@ -30,7 +33,8 @@ class Data_Getter_Train:
     def get_data(self):
         """
         Method Name :   get_data
-        Description :   This method reads the data from the source
+        Description :   This method reads the data from the source and converts the columns to the compact
+                        dtypes declared in the schema file
         Output      :   A pandas dataframe
         On failure  :   Raise Exception
         Written by  :   iNeuron Intelligence
@@ -48,13 +52,29 @@ class Data_Getter_Train:
         )
 
         try:
-            df = self.blob.read_csv(
-                file_name=self.train_csv_file,
+            df = self.blob.read_df(
+                file_name=self.train_file,
+                container_name=self.input_files_container,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+                use_cache=False,
+            )
+
+            schema = self.blob.read_json(
+                file_name=self.schema_file,
                 container_name=self.input_files_container,
                 db_name=self.db_name,
                 collection_name=self.collection_name,
             )
 
+            df = to_storage_dtypes(df, get_schema_dtypes(schema["ColName"]))
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+                log_info=f"Converted columns to {self.schema_file} schema dtypes, memory usage is {df.memory_usage().sum()} bytes",
+            )
+
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
@@ -1,11 +1,52 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from joblib import effective_n_jobs
 from kneed import KneeLocator
 from matplotlib import pyplot as plt
 from phising.blob_storage_operations.blob_operations import Blob_Operation
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from threadpoolctl import threadpool_limits
+from utils.dtype_utils import to_estimator_dtype
+from utils.hash_utils import get_dataframe_hash
 from utils.logger import App_Logger
 from utils.read_params import read_params
 
 
+def fit_kmeans(data, n_clusters, init, random_state, algorithm, batch_size):
+    """
+    Method Name :   fit_kmeans
+    Description :   This method fits KMeans or MiniBatchKMeans with n_clusters on the data
+    Output      :   (wcss, cluster centers) tuple
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    kwargs = {"n_init": 1} if isinstance(init, np.ndarray) else {}
+
+    if algorithm == "minibatch":
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            init=init,
+            random_state=random_state,
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+    else:
+        kmeans = KMeans(
+            n_clusters=n_clusters, init=init, random_state=random_state, **kwargs
+        )
+
+    kmeans.fit(data)
+
+    return kmeans.inertia_, kmeans.cluster_centers_
+
+
 class KMeans_Clustering:
     """
     Description :   This class shall  be used to divide the data into clusters before training.
@@ -34,26 +75,156 @@ class KMeans_Clustering:
 
         self.kmeans_direction = self.config["kmeans_cluster"]["knee"]["direction"]
 
+        self.elbow_n_jobs = self.config["kmeans_cluster"]["elbow"]["n_jobs"]
+
+        self.elbow_sample_size = self.config["kmeans_cluster"]["elbow"]["sample_size"]
+
+        self.elbow_algorithm = self.config["kmeans_cluster"]["elbow"]["algorithm"]
+
+        self.elbow_batch_size = self.config["kmeans_cluster"]["elbow"]["batch_size"]
+
+        self.elbow_warm_start = self.config["kmeans_cluster"]["elbow"]["warm_start"]
+
         self.blob = Blob_Operation()
 
         self.elbow_plot_file = self.config["elbow_plot"]
 
         self.trained_model_dir = self.config["model_dir"]["trained"]
 
+        self.kmeans_cache_dir = self.config["kmeans_cache"]["dir"]
+
+        self.kmeans_cache_max_entries = self.config["kmeans_cache"]["max_entries"]
+
+        self.kmeans_cache_index_file = self.kmeans_cache_dir + "/index.json"
+
+        self.model_save_format = self.config["model_utils"]["save_format"]
+
         self.log_writer = App_Logger()
 
         self.class_name = self.__class__.__name__
 
-    def elbow_plot(self, data):
+    def get_elbow_params(self):
         """
-        Method Name :   elbow_plot
-        Description :   This method saves the plot to blob container and decides the optimum number of clusters to the file.
-        Output      :   A picture saved to the container
+        Method Name :   get_elbow_params
+        Description :   This method is used for getting the settings which change the wcss curve and the knee,
+                        the settings which only change the parallelism of the elbow search are left out
+
+        Version     :   1.2
+        Revisions   :   Moved to setup to cloud
+        """
+        params = {
+            "init": self.kmeans_init,
+            "random_state": self.random_state,
+            "max_clusters": self.max_clusters,
+            "curve": self.kmeans_curve,
+            "direction": self.kmeans_direction,
+            "sample_size": self.elbow_sample_size,
+            "algorithm": self.elbow_algorithm,
+            "warm_start": self.elbow_warm_start,
+        }
+
+        if self.elbow_algorithm == "minibatch":
+            params["batch_size"] = self.elbow_batch_size
+
+        return params
+
+    def get_fingerprint(self, data, params):
+        """
+        Method Name :   get_fingerprint
+        Description :   This method is used for getting the digest of the training matrix together with the
+                        params which change the result, under which the clustering results are cached
+
+        Version     :   1.2
+        Revisions   :   Moved to setup to cloud
+        """
+        digest = hashlib.sha256(get_dataframe_hash(data).encode())
+
+        digest.update(json.dumps(params, sort_keys=True).encode())
+
+        return digest.hexdigest()
+
+    def touch_cache_entry(self, fingerprint):
+        """
+        Method Name :   touch_cache_entry
+        Description :   This method is used for recording the use of the fingerprint in the index of the kmeans
+                        cache, and deleting the folders of the least recently used fingerprints beyond
+                        kmeans_cache.max_entries
+
+        Version     :   1.2
+        Revisions   :   Moved to setup to cloud
+        """
+        method_name = self.touch_cache_entry.__name__
+
+        try:
+            index = {}
+
+            if self.blob.load_file(
+                file_name=self.kmeans_cache_index_file,
+                container_name=self.model_container,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            ):
+                index = self.blob.read_json(
+                    file_name=self.kmeans_cache_index_file,
+                    container_name=self.model_container,
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )
+
+            index[fingerprint] = time.time()
+
+            lru_fingerprints = sorted(index, key=index.get)
+
+            n_evicted = max(len(index) - self.kmeans_cache_max_entries, 0)
+
+            for old_fingerprint in lru_fingerprints[:n_evicted]:
+                self.blob.delete_folder(
+                    folder_name=self.kmeans_cache_dir + "/" + old_fingerprint,
+                    container_name=self.model_container,
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )
+
+                del index[old_fingerprint]
+
+            self.blob.upload_data(
+                data=json.dumps(index).encode(),
+                container_file_name=self.kmeans_cache_index_file,
+                container_name=self.model_container,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+                log_info=f"Recorded {fingerprint} in kmeans cache index, evicted {n_evicted} entries",
+            )
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+    def get_wcss(self, data):
+        """
+        Method Name :   get_wcss
+        Description :   This method computes the wcss for every number of clusters from 1 to max_clusters - 1,
+                        on a sample of elbow.sample_size rows when it is set. The numbers of clusters are fitted
+                        concurrently in a thread pool, with the native thread pools limited to one thread for the
+                        whole search, or one after the other when elbow.warm_start is set, with every fit starting
+                        from the previous centroids and the point farthest from them
+        Output      :   List of wcss values
         On Failure  :   Raise Exception
+
         Version     :   1.2
         Revisions   :   Moved to setup to cloud
         """
-        method_name = self.elbow_plot.__name__
+        method_name = self.get_wcss.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -63,42 +234,165 @@ class KMeans_Clustering:
             collection_name=self.collection_name,
         )
 
-        wcss = []
-
         try:
-            for i in range(1, self.max_clusters):
-                kmeans = KMeans(
-                    n_clusters=i, init=self.kmeans_init, random_state=self.random_state
+            if self.elbow_sample_size and len(data) > self.elbow_sample_size:
+                data = data.sample(
+                    n=self.elbow_sample_size, random_state=self.random_state
                 )
 
-                kmeans.fit(data)
+            X = to_estimator_dtype(data).to_numpy()
+
+            n_clusters = list(range(1, self.max_clusters))
 
-                wcss.append(kmeans.inertia_)
+            if self.elbow_warm_start:
+                wcss, centers = [], None
 
-            plt.plot(range(1, self.max_clusters), wcss)
+                for i in n_clusters:
+                    if centers is None:
+                        init = self.kmeans_init
 
-            plt.title("The Elbow Method")
+                    else:
+                        dist = (
+                            (X**2).sum(axis=1)[:, None]
+                            - 2 * X @ centers.T
+                            + (centers**2).sum(axis=1)[None, :]
+                        )
 
-            plt.xlabel("Number of clusters")
+                        farthest = X[dist.min(axis=1).argmax()]
 
-            plt.ylabel("WCSS")
+                        init = np.vstack([centers, farthest])
 
-            plt.savefig(self.elbow_plot_file)
+                    inertia, centers = fit_kmeans(
+                        X,
+                        i,
+                        init,
+                        self.random_state,
+                        self.elbow_algorithm,
+                        self.elbow_batch_size,
+                    )
+
+                    wcss.append(inertia)
+
+            else:
+                n_workers = min(effective_n_jobs(self.elbow_n_jobs), len(n_clusters))
+
+                with threadpool_limits(limits=1):
+                    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                        results = executor.map(
+                            fit_kmeans,
+                            [X] * len(n_clusters),
+                            n_clusters,
+                            [self.kmeans_init] * len(n_clusters),
+                            [self.random_state] * len(n_clusters),
+                            [self.elbow_algorithm] * len(n_clusters),
+                            [self.elbow_batch_size] * len(n_clusters),
+                        )
+
+                        wcss = [inertia for inertia, _ in results]
 
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.collection_name,
-                log_info="Saved elbow_plot fig and local copy is created",
+                log_info=f"Computed wcss for {len(n_clusters)} numbers of clusters on {len(X)} rows with {self.elbow_algorithm} algorithm",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
             )
 
-            self.blob.upload_file(
-                local_file_name=self.elbow_plot_file,
-                container_file_name=self.elbow_plot_file,
-                container_name=self.input_files_container,
+            return wcss
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+    def elbow_plot(self, data):
+        """
+        Method Name :   elbow_plot
+        Description :   This method saves the plot to blob container and decides the optimum number of clusters to the file.
+                        The wcss curve and the knee are cached under the fingerprint of the data, and when the
+                        cache has them the curve is not computed again
+        Output      :   A picture saved to the container
+        On Failure  :   Raise Exception
+        Version     :   1.2
+        Revisions   :   Moved to setup to cloud
+        """
+        method_name = self.elbow_plot.__name__
+
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+        )
+
+        try:
+            fingerprint = self.get_fingerprint(data, self.get_elbow_params())
+
+            self.touch_cache_entry(fingerprint)
+
+            elbow_cache_file = self.kmeans_cache_dir + "/" + fingerprint + "/elbow.json"
+
+            is_cached = self.blob.load_file(
+                file_name=elbow_cache_file,
+                container_name=self.model_container,
                 db_name=self.db_name,
                 collection_name=self.collection_name,
             )
 
+            if is_cached:
+                wcss = self.blob.read_json(
+                    file_name=elbow_cache_file,
+                    container_name=self.model_container,
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )["wcss"]
+
+                self.log_writer.log(
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                    log_info=f"Loaded wcss curve from {elbow_cache_file}, skipped the elbow search",
+                )
+
+            else:
+                wcss = self.get_wcss(data)
+
+                plt.plot(range(1, self.max_clusters), wcss)
+
+                plt.title("The Elbow Method")
+
+                plt.xlabel("Number of clusters")
+
+                plt.ylabel("WCSS")
+
+                plot_buffer = BytesIO()
+
+                plt.savefig(plot_buffer, format="png")
+
+                self.log_writer.log(
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                    log_info="Saved elbow_plot fig to in memory buffer",
+                )
+
+                self.blob.upload_data(
+                    data=plot_buffer.getvalue(),
+                    container_file_name=self.elbow_plot_file,
+                    container_name=self.input_files_container,
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )
+
             self.kn = KneeLocator(
                 range(1, self.max_clusters),
                 wcss,
@@ -106,6 +400,20 @@ class KMeans_Clustering:
                 direction=self.kmeans_direction,
             )
 
+            if not is_cached:
+                elbow = {
+                    "wcss": [float(w) for w in wcss],
+                    "knee": None if self.kn.knee is None else int(self.kn.knee),
+                }
+
+                self.blob.upload_data(
+                    data=json.dumps(elbow).encode(),
+                    container_file_name=elbow_cache_file,
+                    container_name=self.model_container,
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )
+
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.collection_name,
@@ -134,7 +442,9 @@ class KMeans_Clustering:
     def create_clusters(self, data, number_of_clusters):
         """
         Method Name :   create_clusters
-        Description :   Create a new dataframe consisting of the cluster information.
+        Description :   Create a new dataframe consisting of the cluster information. The fitted KMeans model is
+                        cached under the fingerprint of the data, and when the cache has it the model is loaded
+                        instead of fitted
         Output      :   A datframe with cluster column
         On Failure  :   Raise Exception
         Version     :   1.2
@@ -153,13 +463,56 @@ class KMeans_Clustering:
         self.data = data
 
         try:
-            self.kmeans = KMeans(
-                n_clusters=number_of_clusters,
-                init=self.kmeans_init,
-                random_state=self.random_state,
+            fingerprint = self.get_fingerprint(
+                data, {"init": self.kmeans_init, "random_state": self.random_state}
+            )
+
+            self.touch_cache_entry(fingerprint)
+
+            kmeans_cache_dir = (
+                f"{self.kmeans_cache_dir}/{fingerprint}/{number_of_clusters}"
+            )
+
+            is_cached = self.blob.load_file(
+                file_name=kmeans_cache_dir + "/KMeans" + self.model_save_format,
+                container_name=self.model_container,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
             )
 
-            self.y_kmeans = self.kmeans.fit_predict(data)
+            if is_cached:
+                self.kmeans = self.blob.load_model(
+                    model_name="KMeans",
+                    container_name=self.model_container,
+                    model_dir=kmeans_cache_dir + "/",
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )
+
+                self.y_kmeans = self.kmeans.predict(to_estimator_dtype(data))
+
+                self.log_writer.log(
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                    log_info=f"Loaded KMeans model from {kmeans_cache_dir}, skipped the clustering",
+                )
+
+            else:
+                self.kmeans = KMeans(
+                    n_clusters=number_of_clusters,
+                    init=self.kmeans_init,
+                    random_state=self.random_state,
+                )
+
+                self.y_kmeans = self.kmeans.fit_predict(to_estimator_dtype(data))
+
+                self.blob.save_model(
+                    model=self.kmeans,
+                    model_dir=kmeans_cache_dir,
+                    container_name=self.model_container,
+                    db_name=self.db_name,
+                    collection_name=self.collection_name,
+                )
 
             self.blob.save_model(
                 model=self.kmeans,
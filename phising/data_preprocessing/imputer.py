@@ -0,0 +1,150 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from joblib import effective_n_jobs
+from sklearn.impute import KNNImputer
+
+
+class Imputer:
+    """
+    Description :   This class holds the imputation fitted on the training data, the columns kept for training,
+                    their dtypes and means, and for the knn strategy the fitted KNNImputer, so that the same
+                    imputation can be applied at prediction time without recomputing anything from the
+                    prediction batch
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+
+    def __init__(
+        self,
+        strategy,
+        null_threshold,
+        estimator_dtype,
+        knn_params=None,
+        batch_size=None,
+        n_jobs=None,
+    ):
+        if strategy not in ("mean", "knn"):
+            raise Exception(f"Unknown imputer strategy : {strategy}")
+
+        self.strategy = strategy
+
+        self.null_threshold = null_threshold
+
+        self.estimator_dtype = estimator_dtype
+
+        self.knn_params = dict(knn_params or {})
+
+        self.batch_size = batch_size
+
+        self.n_jobs = n_jobs
+
+        self.columns = []
+
+        self.dropped_columns = []
+
+        self.dtypes = {}
+
+        self.means = {}
+
+        self.knn = None
+
+    def fit(self, data):
+        """
+        Method Name :   fit
+        Description :   This method drops the columns which have a null fraction of null_threshold or more and
+                        computes the means and output dtypes of the kept columns, for the knn strategy the
+                        KNNImputer is fitted on the kept columns
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        null_fraction = data.isna().mean()
+
+        self.columns = data.columns[null_fraction < self.null_threshold].to_list()
+
+        self.dropped_columns = data.columns[
+            null_fraction >= self.null_threshold
+        ].to_list()
+
+        kept = data[self.columns]
+
+        null_cols = kept.columns[kept.isna().any()]
+
+        self.dtypes = {
+            col: str(self.estimator_dtype if col in null_cols else kept[col].dtype)
+            for col in self.columns
+        }
+
+        self.means = kept.mean().astype(float).to_dict()
+
+        if self.strategy == "knn":
+            self.knn = KNNImputer(**self.knn_params).fit(
+                kept.to_numpy(dtype=self.estimator_dtype, na_value=np.nan)
+            )
+
+        return self
+
+    def transform(self, data):
+        """
+        Method Name :   transform
+        Description :   This method drops the columns dropped at fit time, adds the missing kept columns and
+                        fills the missing values with the fitted strategy. The kept columns are returned in the
+                        fitted order after the columns which are not part of the fitted data
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        data = data.drop(columns=[c for c in self.dropped_columns if c in data.columns])
+
+        data = data.assign(**{c: float("nan") for c in self.columns if c not in data})
+
+        has_null = data[self.columns].isna().any()
+
+        data = data.astype(
+            {
+                col: self.estimator_dtype if has_null[col] else dtype
+                for col, dtype in self.dtypes.items()
+            }
+        )
+
+        other_cols = [c for c in data.columns if c not in self.dtypes]
+
+        data = data[other_cols + self.columns]
+
+        if self.strategy == "knn" and has_null.any():
+            data = self.knn_fill(data, has_null[has_null].index.to_list())
+
+        return data.fillna(self.means)
+
+    def knn_fill(self, data, null_cols):
+        """
+        Method Name :   knn_fill
+        Description :   This method fills the missing values with the fitted KNNImputer. Only the rows with missing
+                        values are imputed, in batches of batch_size rows so that the distance matrices stay
+                        bounded, and the batches are imputed in parallel on n_jobs threads
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        null_rows = data[null_cols].isna().any(axis=1).to_numpy()
+
+        X = data.loc[null_rows, self.columns].to_numpy(
+            dtype=self.estimator_dtype, na_value=np.nan
+        )
+
+        batches = [
+            X[i : i + self.batch_size] for i in range(0, len(X), self.batch_size)
+        ]
+
+        with ThreadPoolExecutor(max_workers=effective_n_jobs(self.n_jobs)) as executor:
+            imputed = np.vstack(list(executor.map(self.knn.transform, batches)))
+
+        col_idx = [self.columns.index(col) for col in null_cols]
+
+        data.loc[null_rows, null_cols] = imputed[:, col_idx].astype(
+            self.estimator_dtype
+        )
+
+        return data
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 from phising.blob_storage_operations.blob_operations import Blob_Operation
+from phising.data_preprocessing.imputer import Imputer
 from utils.logger import App_Logger
 from utils.model_utils import Model_Utils
 from utils.read_params import read_params
@@ -26,6 +27,32 @@ class Preprocessor:
 
         self.null_values_file = self.config["null_values_csv_file"]
 
+        self.upload_null_report = self.config["null_values_report"]["upload"]
+
+        self.upload_null_report_in_background = self.config["null_values_report"][
+            "background"
+        ]
+
+        self.estimator_dtype = self.config["dtypes"]["estimator"]
+
+        self.imputer_strategy = self.config["imputer"]["strategy"]
+
+        self.null_threshold = self.config["imputer"]["null_threshold"]
+
+        self.imputer_batch_size = self.config["imputer"]["batch_size"]
+
+        self.imputer_n_jobs = self.config["imputer"]["n_jobs"]
+
+        self.knn_params = {
+            "n_neighbors": self.config["knn_imputer"]["n_neighbors"],
+            "weights": self.config["knn_imputer"]["weights"],
+            "missing_values": float(self.config["knn_imputer"]["missing_values"]),
+        }
+
+        self.model_container = self.config["container"]["phising_model_container"]
+
+        self.trained_model_dir = self.config["models_dir"]["trained"]
+
         self.n_components = self.config["pca_model"]["n_components"]
 
         self.input_files_container = self.config["container"]["input_files"]
@@ -130,12 +157,39 @@ class Preprocessor:
                 collection_name=self.collection_name,
             )
 
+    def get_null_profile(self, data):
+        """
+        Method Name :   get_null_profile
+        Description :   This method counts the null values of all the columns in one pass
+        Output      :   A Dataframe with the missing values count and ratio of every column, and the list of
+                        columns which have null values
+        On Failure  :   Raise Exception
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        null_counts = data.isna().sum()
+
+        null_profile = pd.DataFrame(
+            {
+                "columns": data.columns,
+                "missing values count": null_counts.to_numpy(),
+                "missing values ratio": null_counts.to_numpy() / max(len(data), 1),
+            }
+        )
+
+        cols_with_missing_values = null_counts.index[null_counts > 0].to_list()
+
+        return null_profile, cols_with_missing_values
+
     def is_null_present(self, data):
         """
         Method Name :   is_null_present
         Description :   This method checks whether there are null values present in the pandas Dataframe or not.
-        Output      :   Returns True if null values are present in the DataFrame, False if they are not present and
-                        returns the list of columns for which null values are present.
+                        When null values are present the null values report is uploaded, in background when
+                        null_values_report.background is set, so the caller does not wait for the upload.
+                        The outcome of the background upload is logged by log_null_report_upload
+        Output      :   Returns True if null values are present in the DataFrame, False if they are not present
         On Failure  :   Raise Exception
         Version     :   1.2
         Revisions   :   moved setup to cloud
@@ -150,68 +204,44 @@ class Preprocessor:
             collection_name=self.collection_name,
         )
 
-        null_present = False
-
-        cols_with_missing_values = []
-
-        cols = data.columns
-
         try:
-            self.null_counts = data.isna().sum()
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info=f"Null values count is : {self.null_counts}",
-            )
-
-            for i in range(len(self.null_counts)):
-                if self.null_counts[i] > 0:
-                    null_present = True
+            (
+                self.dataframe_with_null,
+                cols_with_missing_values,
+            ) = self.get_null_profile(data)
 
-                    cols_with_missing_values.append(cols[i])
-
-            self.log_writer.log(
-                db_name=self.db_name,
-                collection_name=self.collection_name,
-                log_info="Created cols with missing values",
-            )
+            null_present = len(cols_with_missing_values) > 0
 
             if null_present:
                 self.log_writer.log(
                     db_name=self.db_name,
                     collection_name=self.collection_name,
-                    log_info="Null values were found the columns...preparing dataframe with null values",
+                    log_info=f"Null values are present in {cols_with_missing_values} columns",
                 )
 
-                self.dataframe_with_null = pd.DataFrame()
-
-                self.dataframe_with_null["columns"] = data.columns
-
-                self.dataframe_with_null["missing values count"] = np.asarray(
-                    data.isna().sum()
+            if null_present and self.upload_null_report:
+                upload_func = (
+                    self.blob.upload_df_as_csv_in_background
+                    if self.upload_null_report_in_background
+                    else self.blob.upload_df_as_csv
                 )
 
-                self.log_writer.log(
-                    db_name=self.db_name,
-                    collection_name=self.collection_name,
-                    log_info="Created dataframe with null values",
-                )
-
-                self.blob.upload_df_as_csv(
+                future = upload_func(
                     dataframe=self.dataframe_with_null,
-                    local_file_name=self.null_values_file,
                     container_file_name=self.null_values_file,
                     container_name=self.input_files_container,
                     db_name=self.db_name,
                     collection_name=self.collection_name,
                 )
 
+                if future is not None:
+                    future.add_done_callback(self.log_null_report_upload)
+
             else:
                 self.log_writer.log(
                     db_name=self.db_name,
                     collection_name=self.collection_name,
-                    log_info="No null values are present in cols. Skipped the creation of dataframe",
+                    log_info="Skipped the upload of null values report",
                 )
 
             self.log_writer.start_log(
@@ -233,10 +263,100 @@ class Preprocessor:
                 collection_name=self.collection_name,
             )
 
-    def impute_missing_values(self, data):
+    def log_null_report_upload(self, future):
+        """
+        Method Name :   log_null_report_upload
+        Description :   This method is the done callback of the background upload of the null values report,
+                        it logs the outcome of the upload so that a failure is not lost
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        error = future.exception()
+
+        func = lambda: (
+            "Uploaded null values report in background"
+            if error is None
+            else f"Background upload of null values report failed, Error : {str(error)}"
+        )
+
+        self.log_writer.log(
+            db_name=self.db_name,
+            collection_name=self.collection_name,
+            log_info=func(),
+        )
+
+    def fit_imputer(self, data):
+        """
+        Method Name :   fit_imputer
+        Description :   This method fits the imputer with the strategy from params.yaml (mean or knn) on the
+                        training data and saves it next to the KMeans model, so that prediction reuses the
+                        training columns, dtypes, means and the fitted knn imputer
+        Output      :   The fitted imputer
+        On Failure  :   Raise Exception
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.fit_imputer.__name__
+
+        try:
+            self.log_writer.start_log(
+                key="start",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+            imputer = Imputer(
+                strategy=self.imputer_strategy,
+                null_threshold=self.null_threshold,
+                estimator_dtype=self.estimator_dtype,
+                knn_params=self.knn_params,
+                batch_size=self.imputer_batch_size,
+                n_jobs=self.imputer_n_jobs,
+            ).fit(data)
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+                log_info=f"Fitted {self.imputer_strategy} imputer, kept {len(imputer.columns)} columns and dropped {imputer.dropped_columns} columns",
+            )
+
+            self.blob.save_model(
+                model=imputer,
+                model_dir=self.trained_model_dir,
+                container_name=self.model_container,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+            return imputer
+
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.collection_name,
+            )
+
+    def impute_missing_values(self, data, imputer):
         """
         Method Name :   impute_missing_values
-        Description :   This method replaces all the missing values in the Dataframe using mean values of the column.
+        Description :   This method replaces all the missing values in the Dataframe with the fitted imputer,
+                        and keeps only the columns the imputer was fitted with.
+                        Only the imputed columns are converted to the estimator dtype, the rest keep their compact dtype
         Output      :   A Dataframe which has all the missing values imputed.
         On Failure  :   Raise Exception
 
@@ -254,12 +374,7 @@ class Preprocessor:
                 collection_name=self.collection_name,
             )
 
-            data = data[data.columns[data.isnull().mean() < 0.6]]
-
-            data = data.apply(pd.to_numeric)
-
-            for col in data.columns:
-                data[col] = data[col].replace(np.NaN, data[col].mean())
+            data = imputer.transform(data)
 
             self.log_writer.start_log(
                 key="exit",
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from phising.blob_storage_operations.blob_operations import Blob_Operation
 from utils.logger import App_Logger
 from utils.read_params import read_params
@@ -28,10 +30,43 @@ class Data_Transform_Train:
 
         self.train_data_transform_log = self.config["train_db_log"]["data_transform"]
 
-    def add_quotes_to_string(self):
+        self.max_concurrency = self.config["blob_storage"]["max_concurrency"]
+
+    def add_quotes_to_file(self, f):
+        """
+        Method Name :   add_quotes_to_file
+        Description :   This method replaces the "?" values of the file with quoted values in one pass over the
+                        dataframe, the file is uploaded only when some value was replaced
+        Output      :   (dataframe, file, file name) tuple of the transformed file
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        df, file, abs_f = f
+
+        is_missing = df == "?"
+
+        if not is_missing.to_numpy().any():
+            return f
+
+        df = df.mask(is_missing, "'?'")
+
+        self.blob.upload_df_as_csv(
+            dataframe=df,
+            container_file_name=file,
+            container_name=self.train_data_container,
+            db_name=self.db_name,
+            collection_name=self.train_data_transform_log,
+        )
+
+        return df, file, abs_f
+
+    def add_quotes_to_string(self, lst=None):
         """
         Method Name :   add_quotes_to_string
         Description :   This method addes the quotes to the string data present in columns
+        Output      :   List of (dataframe, file, file name) tuples of the transformed csv files, when lst is not
+                        given the files are read from the good data folder. The files are transformed in parallel
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
@@ -47,44 +82,26 @@ class Data_Transform_Train:
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
-                folder_name=self.good_train_data_dir,
-                container_name=self.train_data_container,
-                db_name=self.db_name,
-                collection_name=self.train_data_transform_log,
-            )
-
-            for f in lst:
-                df = f[0]
-
-                file = f[1]
+            if lst is None:
+                lst = self.blob.read_csv_from_folder(
+                    folder_name=self.good_train_data_dir,
+                    container_name=self.train_data_container,
+                    db_name=self.db_name,
+                    collection_name=self.train_data_transform_log,
+                )
 
-                abs_f = f[2]
+            csv_lst = [f for f in lst if f[1].endswith(".csv")]
 
-                if file.endswith(".csv"):
-                    for column in df.columns:
-                        count = df[column][df[column] == "?"].count()
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                transformed = list(executor.map(self.add_quotes_to_file, csv_lst))
 
-                        if count != 0:
-                            df[column] = df[column].replace("?", "'?'")
+            n_changed = sum(t is not f for t, f in zip(transformed, csv_lst))
 
-                    self.log_writer.log(
-                        db_name=self.db_name,
-                        collection_name=self.train_data_transform_log,
-                        log_info=f"Quotes added for the file {file}",
-                    )
-
-                    self.blob.upload_df_as_csv(
-                        dataframe=df,
-                        local_file_name=abs_f,
-                        container_file_name=file,
-                        container_name=self.train_data_container,
-                        db_name=self.db_name,
-                        collection_name=self.train_data_transform_log,
-                    )
-
-                else:
-                    pass
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.train_data_transform_log,
+                log_info=f"Quotes added for {n_changed} of {len(csv_lst)} files, the unchanged files were not uploaded",
+            )
 
             self.log_writer.start_log(
                 key="exit",
@@ -94,6 +111,8 @@ class Data_Transform_Train:
                 collection_name=self.train_data_transform_log,
             )
 
+            return transformed
+
         except Exception as e:
             self.log_writer.exception_log(
                 error=e,
@@ -1,5 +1,9 @@
+from datetime import datetime, timedelta
+
 from phising.blob_storage_operations.blob_operations import Blob_Operation
 from phising.mongo_db_operations.mongo_operations import MongoDB_Operation
+from utils.dtype_utils import get_schema_dtypes
+from utils.hash_utils import get_dataframe_hash
 from utils.logger import App_Logger
 from utils.read_params import read_params
 
@@ -21,7 +25,9 @@ class DB_Operation_Pred:
 
         self.pred_data_container = self.config["container"]["phising_pred_data"]
 
-        self.pred_export_csv_file = self.config["export_csv_file"]["pred"]
+        self.pred_export_file = self.config["export_file"]["pred"]
+
+        self.schema_file = self.config["schema_file"]["pred_schema_file"]
 
         self.good_data_pred_dir = self.config["data"]["pred"]["good_data_dir"]
 
@@ -29,18 +35,30 @@ class DB_Operation_Pred:
 
         self.pred_db_insert_log = self.config["pred_db_log"]["db_insert"]
 
+        self.pred_manifest_collection = self.config["mongodb"][
+            "phising_pred_manifest_collection"
+        ]
+
         self.pred_export_csv_log = self.config["pred_db_log"]["export_csv"]
 
+        self.manifest_claim_timeout = self.config["mongodb"]["manifest_claim_timeout"]
+
         self.blob = Blob_Operation()
 
         self.db_op = MongoDB_Operation()
 
         self.log_writer = App_Logger()
 
-    def insert_good_data_as_record(self, good_data_db_name, good_data_collection_name):
+    def insert_good_data_as_record(
+        self, good_data_db_name, good_data_collection_name, lst=None
+    ):
         """
         Method Name :   insert_good_data_as_record
-        Description :   This method inserts the good data in MongoDB as collection
+        Description :   This method inserts the good data in MongoDB as collection, when lst of
+                        (dataframe, file, file name) tuples is not given the files are read from the good data folder.
+                        Every file is claimed by its content hash in the manifest collection before its rows are
+                        inserted, and the files which are already ingested or claimed by another run are skipped.
+                        The rows are tagged with the hash, so the rows of a failed attempt are deleted before a retry
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
@@ -56,32 +74,88 @@ class DB_Operation_Pred:
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
-                folder_name=self.good_data_pred_dir,
-                container_name=self.pred_data_container,
-                db_name=self.db_name,
-                collection_name=self.pred_db_insert_log,
+            if lst is None:
+                lst = self.blob.read_csv_from_folder(
+                    folder_name=self.good_data_pred_dir,
+                    container_name=self.pred_data_container,
+                    db_name=self.db_name,
+                    collection_name=self.pred_db_insert_log,
+                )
+
+            self.db_op.create_index(
+                db_name=good_data_db_name,
+                collection_name=self.pred_manifest_collection,
+                key="file_hash",
+                unique=True,
+            )
+
+            self.db_op.create_index(
+                db_name=good_data_db_name,
+                collection_name=good_data_collection_name,
+                key="file_hash",
             )
 
-            for f in lst:
-                df = f[0]
+            for df, file, _ in lst:
+                if not file.endswith(".csv"):
+                    continue
 
-                file = f[1]
+                file_hash = get_dataframe_hash(df)
+
+                is_claimed = self.db_op.claim_record(
+                    db_name=good_data_db_name,
+                    collection_name=self.pred_manifest_collection,
+                    query={"file_hash": file_hash},
+                    data={"file_name": file},
+                    stale_before=datetime.utcnow()
+                    - timedelta(seconds=self.manifest_claim_timeout),
+                )
+
+                if not is_claimed:
+                    self.log_writer.log(
+                        db_name=self.db_name,
+                        collection_name=self.pred_db_insert_log,
+                        log_info=f"Skipped {file}, its content is already ingested or being ingested by another run",
+                    )
 
-                if file.endswith(".csv"):
-                    self.db_op.insert_dataframe_as_record(
-                        data_frame=df,
+                    continue
+
+                try:
+                    self.db_op.delete_records(
+                        db_name=good_data_db_name,
+                        collection_name=good_data_collection_name,
+                        query={"file_hash": file_hash},
+                    )
+
+                    inserted = self.db_op.insert_dataframe_as_record(
+                        data_frame=df.assign(file_hash=file_hash),
                         db_name=good_data_db_name,
                         collection_name=good_data_collection_name,
                     )
 
-                else:
-                    pass
+                except Exception:
+                    self.db_op.delete_records(
+                        db_name=good_data_db_name,
+                        collection_name=self.pred_manifest_collection,
+                        query={"file_hash": file_hash, "status": "pending"},
+                    )
+
+                    raise
+
+                self.db_op.update_record(
+                    db_name=good_data_db_name,
+                    collection_name=self.pred_manifest_collection,
+                    query={"file_hash": file_hash},
+                    data={
+                        "status": "complete",
+                        "row_count": inserted,
+                        "ingested_at": datetime.utcnow(),
+                    },
+                )
 
                 self.log_writer.log(
                     db_name=self.db_name,
                     collection_name=self.pred_db_insert_log,
-                    log_info="Inserted dataframe as collection record in mongodb",
+                    log_info=f"Inserted {inserted} records of {file} in mongodb",
                 )
 
             self.log_writer.start_log(
@@ -105,7 +179,8 @@ class DB_Operation_Pred:
         """
         Method Name :   export_collection_to_csv
 
-        Description :   This method extracts the inserted data to csv file, which will be used for preding
+        Description :   This method extracts the inserted data to the export file, written as csv or parquet
+                        depending on the file extension, which will be used for preding
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
@@ -120,20 +195,34 @@ class DB_Operation_Pred:
         )
 
         try:
-            df = self.db_op.get_collection_as_dataframe(
+            schema = self.blob.read_json(
+                file_name=self.schema_file,
+                container_name=self.input_files_container,
+                db_name=self.db_name,
+                collection_name=self.pred_export_csv_log,
+            )
+
+            dfs = self.db_op.get_collection_in_batches(
                 db_name=good_data_db_name,
                 collection_name=good_data_collection_name,
+                exclude_fields=("file_hash",),
             )
 
-            self.blob.upload_df_as_csv(
-                dataframe=df,
-                local_file_name=self.pred_export_csv_file,
-                container_file_name=self.pred_export_csv_file,
+            n_rows = self.blob.upload_df_in_batches(
+                dataframes=dfs,
+                dtypes=get_schema_dtypes(schema["ColName"]),
+                container_file_name=self.pred_export_file,
                 container_name=self.input_files_container,
                 db_name=self.db_name,
                 collection_name=self.pred_export_csv_log,
             )
 
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.pred_export_csv_log,
+                log_info=f"Exported {n_rows} records to {self.pred_export_file} file",
+            )
+
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
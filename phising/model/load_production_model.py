@@ -1,4 +1,5 @@
 from phising.blob_storage_operations.blob_operations import Blob_Operation
+from phising.data_preprocessing.imputer import Imputer
 from phising.mlflow_utils.mlflow_operations import MLFlow_Operations
 from utils.logger import App_Logger
 from utils.read_params import read_params
@@ -31,6 +32,10 @@ class Load_Prod_Model:
 
         self.stag_model_dir = self.config["models_dir"]["stag"]
 
+        self.trained_model_dir = self.config["models_dir"]["trained"]
+
+        self.model_save_format = self.config["model_utils"]["save_format"]
+
         self.exp_name = self.config["mlflow_config"]["experiment_name"]
 
         self.blob = Blob_Operation()
@@ -201,6 +206,20 @@ run_number  metrics.XGBoost0-best_score metrics.RandomForest1-best_score metrics
                             to_container_name=self.model_container,
                         )
 
+            ## The imputer is not registered in mlflow, it is fitted along with the kmeans model and
+            ## is needed in production for the prediction data to get the training imputation
+
+            imputer_file = Imputer.__name__ + self.model_save_format
+
+            self.blob.copy_data(
+                from_file_name=self.trained_model_dir + "/" + imputer_file,
+                from_container_name=self.model_container,
+                to_file_name=self.prod_model_dir + "/" + imputer_file,
+                to_container_name=self.model_container,
+                db_name=self.db_name,
+                collection_name=self.load_prod_model_log,
+            )
+
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.load_prod_model_log,
@@ -1,7 +1,9 @@
 import pandas as pd
 from phising.blob_storage_operations.blob_operations import Blob_Operation
 from phising.data_ingestion.data_loader_prediction import Data_Getter_Pred
+from phising.data_preprocessing.imputer import Imputer
 from phising.data_preprocessing.preprocessing import Preprocessor
+from utils.dtype_utils import to_estimator_dtype
 from utils.logger import App_Logger
 from utils.read_params import read_params
 
@@ -188,10 +190,17 @@ class Prediction:
 
             data = self.preprocessor.replace_invalid_values(data)
 
-            is_null_present = self.preprocessor.is_null_present(data)
+            self.preprocessor.is_null_present(data)
 
-            if is_null_present:
-                data = self.preprocessor.impute_missing_values(data)
+            imputer = self.blob.load_model(
+                model_name=Imputer.__name__,
+                container_name=self.model_container,
+                model_dir=self.prod_model_dir,
+                db_name=self.db_name,
+                collection_name=self.pred_log,
+            )
+
+            data = self.preprocessor.impute_missing_values(data, imputer)
 
             kmeans = self.blob.load_model(
                 model_name="KMeans",
@@ -201,7 +210,9 @@ class Prediction:
                 collection_name=self.pred_log,
             )
 
-            clusters = kmeans.predict(data.drop(["phising"], axis=1))
+            clusters = kmeans.predict(
+                to_estimator_dtype(data.drop(["phising"], axis=1))
+            )
 
             data["clusters"] = clusters
 
@@ -229,7 +240,7 @@ class Prediction:
                     collection_name=self.pred_log,
                 )
 
-                result = list(model.predict(cluster_data))
+                result = list(model.predict(to_estimator_dtype(cluster_data)))
 
                 result = pd.DataFrame(
                     list(zip(phising_names, result)), columns=["phising", "prediction"]
@@ -237,7 +248,6 @@ class Prediction:
 
                 self.blob.upload_df_as_csv(
                     dataframe=result,
-                    local_file_name=self.pred_output_file,
                     container_file_name=self.pred_output_file,
                     container_name=self.input_files_container,
                     db_name=self.db_name,
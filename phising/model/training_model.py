@@ -92,15 +92,16 @@ class Train_Model:
 
             data = self.preprocessor.replace_invalid_values(data)
 
-            is_null_present = self.preprocessor.is_null_present(X)
-
-            if is_null_present:
-                X = self.preprocessor.impute_missing_values(X)
-
             X, Y = self.preprocessor.separate_label_feature(
                 data, label_column_name=self.target_col
             )
 
+            self.preprocessor.is_null_present(X)
+
+            imputer = self.preprocessor.fit_imputer(X)
+
+            X = self.preprocessor.impute_missing_values(X, imputer)
+
             number_of_clusters = self.kmeans_op.elbow_plot(X)
 
             X, kmeans_model = self.kmeans_op.create_clusters(
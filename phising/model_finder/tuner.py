@@ -1,4 +1,5 @@
 from sklearn.ensemble import RandomForestClassifier
+from utils.dtype_utils import to_estimator_dtype
 from utils.logger import App_Logger
 from utils.model_utils import Model_Utils
 from utils.read_params import read_params
@@ -234,6 +235,8 @@ class Model_Finder:
         )
 
         try:
+            train_x, test_x = to_estimator_dtype(train_x), to_estimator_dtype(test_x)
+
             xgb_model = self.get_best_params_for_xgboost(train_x, train_y)
 
             xgb_model_score = self.model_utils.get_model_score(
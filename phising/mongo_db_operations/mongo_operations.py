@@ -1,10 +1,33 @@
-import json
 import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
 
 import pandas as pd
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne
+from pymongo.errors import DuplicateKeyError
 from utils.read_params import read_params
 
+_mongo_clients = {}
+
+_mongo_clients_lock = threading.Lock()
+
+
+def get_mongo_client(db_url, max_pool_size):
+    """
+    Method Name :   get_mongo_client
+    Description :   This method is used for getting the process wide MongoClient for the db url,
+                    so that all the MongoDB_Operation objects share one connection pool
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    with _mongo_clients_lock:
+        if db_url not in _mongo_clients:
+            _mongo_clients[db_url] = MongoClient(db_url, maxPoolSize=max_pool_size)
+
+        return _mongo_clients[db_url]
+
 
 class MongoDB_Operation:
     """
@@ -21,7 +44,17 @@ class MongoDB_Operation:
 
         self.DB_URL = os.environ["MONGODB_URL"]
 
-        self.client = MongoClient(self.DB_URL)
+        self.max_pool_size = self.config["mongodb"]["max_pool_size"]
+
+        self.insert_batch_size = self.config["mongodb"]["insert_batch_size"]
+
+        self.insert_workers = self.config["mongodb"]["insert_workers"]
+
+        self.export_batch_size = self.config["mongodb"]["export_batch_size"]
+
+        self.client = get_mongo_client(
+            db_url=self.DB_URL, max_pool_size=self.max_pool_size
+        )
 
     def get_database(self, db_name):
         """
@@ -55,49 +88,270 @@ class MongoDB_Operation:
         except Exception as e:
             raise e
 
-    def get_collection_as_dataframe(self, db_name, collection_name):
+    def get_collection_in_batches(
+        self, db_name, collection_name, batch_size=None, exclude_fields=()
+    ):
         """
-        Method Name :   get_collection_as_dataframe
-        Description :   This method is used for converting the selected collection to dataframe
+        Method Name :   get_collection_in_batches
+        Description :   This method is used for reading the selected collection as dataframes of batch_size rows,
+                        the documents are streamed from the cursor with the _id field and exclude_fields projected out
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
         try:
+            batch_size = batch_size or self.export_batch_size
+
             database = self.get_database(db_name)
 
             collection = self.get_collection(
                 collection_name=collection_name, database=database
             )
 
-            df = pd.DataFrame(list(collection.find()))
+            projection = {field: 0 for field in ("_id",) + tuple(exclude_fields)}
+
+            cursor = collection.find({}, projection).batch_size(batch_size)
+
+            records = []
+
+            for record in cursor:
+                records.append(record)
+
+                if len(records) == batch_size:
+                    yield pd.DataFrame.from_records(records)
+
+                    records = []
 
-            if "_id" in df.columns.to_list():
-                df = df.drop(columns=["_id"], axis=1)
+            if len(records) > 0:
+                yield pd.DataFrame.from_records(records)
 
-            return df
+        except Exception as e:
+            raise e
+
+    def get_collection_as_dataframe(self, db_name, collection_name):
+        """
+        Method Name :   get_collection_as_dataframe
+        Description :   This method is used for converting the selected collection to dataframe
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            dfs = list(
+                self.get_collection_in_batches(
+                    db_name=db_name, collection_name=collection_name
+                )
+            )
+
+            if len(dfs) == 0:
+                return pd.DataFrame()
+
+            return pd.concat(dfs, ignore_index=True)
 
         except Exception as e:
             raise e
 
+    def get_records_in_batches(self, data_frame, batch_size):
+        """
+        Method Name :   get_records_in_batches
+        Description :   This method is used for converting the dataframe to lists of records, one batch of rows
+                        at a time, missing values are converted to None
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        for i in range(0, len(data_frame), batch_size):
+            batch = data_frame.iloc[i : i + batch_size]
+
+            batch = batch.astype(object).where(batch.notna(), None)
+
+            yield batch.to_dict(orient="records")
+
     def insert_dataframe_as_record(self, data_frame, db_name, collection_name):
         """
         Method Name :   insert_dataframe_as_record
-        Description :   This method is used for inserting the dataframe in collection as record
+        Description :   This method is used for inserting the dataframe in collection as record, the rows are
+                        inserted in unordered batches of insert_batch_size by up to insert_workers writers
+        Output      :   Number of records inserted
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
         try:
-            records = json.loads(data_frame.T.to_json()).values()
-
             database = self.get_database(db_name)
 
             collection = self.get_collection(
                 collection_name=collection_name, database=database
             )
 
-            collection.insert_many(records)
+            insert_func = lambda records: len(
+                collection.insert_many(records, ordered=False).inserted_ids
+            )
+
+            batches = self.get_records_in_batches(
+                data_frame=data_frame, batch_size=self.insert_batch_size
+            )
+
+            if self.insert_workers <= 1:
+                return sum(insert_func(records) for records in batches)
+
+            inserted, running = 0, set()
+
+            with ThreadPoolExecutor(max_workers=self.insert_workers) as executor:
+                for records in batches:
+                    if len(running) >= self.insert_workers:
+                        done, running = wait(running, return_when=FIRST_COMPLETED)
+
+                        inserted += sum(f.result() for f in done)
+
+                    running.add(executor.submit(insert_func, records))
+
+                inserted += sum(f.result() for f in running)
+
+            return inserted
+
+        except Exception as e:
+            raise e
+
+    def create_index(self, db_name, collection_name, key, unique=False):
+        """
+        Method Name :   create_index
+        Description :   This method is used for creating an index on the key of the collection, if it does not exist
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            collection.create_index(key, unique=unique)
+
+        except Exception as e:
+            raise e
+
+    def find_records(self, db_name, collection_name, query, projection=None):
+        """
+        Method Name :   find_records
+        Description :   This method is used for getting the records of the collection which match the query
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            return list(collection.find(query, projection))
+
+        except Exception as e:
+            raise e
+
+    def claim_record(self, db_name, collection_name, query, data, stale_before):
+        """
+        Method Name :   claim_record
+        Description :   This method is used for claiming the record matching the query by inserting it with
+                        pending status, the collection must have a unique index on the query keys. A pending
+                        record claimed before stale_before is taken over, as its claimer did not finish
+        Output      :   True if the record was claimed, False if it is complete or claimed by another run
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            record = {
+                **query, **data, "status": "pending", "claimed_at": datetime.utcnow()
+            }
+
+            try:
+                collection.insert_one(record)
+
+                return True
+
+            except DuplicateKeyError:
+                result = collection.update_one(
+                    {**query, "status": "pending", "claimed_at": {"$lt": stale_before}},
+                    {"$set": record},
+                )
+
+                return result.modified_count == 1
+
+        except Exception as e:
+            raise e
+
+    def update_record(self, db_name, collection_name, query, data):
+        """
+        Method Name :   update_record
+        Description :   This method is used for setting the fields of data on the record matching the query
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            collection.update_one(query, {"$set": data})
+
+        except Exception as e:
+            raise e
+
+    def delete_records(self, db_name, collection_name, query):
+        """
+        Method Name :   delete_records
+        Description :   This method is used for deleting the records of the collection which match the query
+        Output      :   Number of records deleted
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            return collection.delete_many(query).deleted_count
+
+        except Exception as e:
+            raise e
+
+    def upsert_records(self, db_name, collection_name, data, key):
+        """
+        Method Name :   upsert_records
+        Description :   This method is used for replacing the records of the collection which have the same key
+                        value as the given records, and inserting the records which do not exist, in one bulk write
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            requests = [ReplaceOne({key: r[key]}, r, upsert=True) for r in data]
+
+            if len(requests) > 0:
+                collection.bulk_write(requests, ordered=False)
 
         except Exception as e:
             raise e
@@ -121,3 +375,23 @@ class MongoDB_Operation:
 
         except Exception as e:
             raise e
+
+    def insert_records(self, db_name, collection_name, data):
+        """
+        Method Name :   insert_records
+        Description :   This method is used for inserting a list of records in database collection
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        try:
+            db = self.get_database(db_name=db_name)
+
+            collection = self.get_collection(
+                collection_name=collection_name, database=db
+            )
+
+            collection.insert_many(data, ordered=False)
+
+        except Exception as e:
+            raise e
@@ -1,6 +1,8 @@
-import re
+from datetime import datetime
 
 from phising.blob_storage_operations.blob_operations import Blob_Operation
+from phising.mongo_db_operations.mongo_operations import MongoDB_Operation
+from utils.file_name_utils import classify_file_names
 from utils.logger import App_Logger
 from utils.read_params import read_params
 
@@ -26,6 +28,16 @@ class Raw_Pred_Data_Validation:
 
         self.blob = Blob_Operation()
 
+        self.db_op = MongoDB_Operation()
+
+        self.manifest_db_name = self.config["mongodb"]["phising_data_db_name"]
+
+        self.pred_validation_manifest = self.config["mongodb"][
+            "phising_pred_validation_manifest_collection"
+        ]
+
+        self.new_files = {}
+
         self.pred_data_container = self.config["container"]["pred_data"]
 
         self.input_files_container = self.config["container"]["input_files"]
@@ -48,10 +60,6 @@ class Raw_Pred_Data_Validation:
 
         self.pred_col_valid_log = self.config["pred_db_log"]["col_validation"]
 
-        self.pred_missing_value_log = self.config["pred_db_log"][
-            "missing_values_in_col"
-        ]
-
     def values_from_schema(self):
         """
         Method Name :   values_from_schema
@@ -176,17 +184,17 @@ class Raw_Pred_Data_Validation:
                 collection_name=self.pred_gen_log,
             )
 
-    def validate_raw_file_name(
-        self, regex, LengthOfDateStampInFile, LengthOfTimeStampInFile
-    ):
+    def get_changed_files(self, files):
         """
-        Method Name :   validate_raw_file_name
-        Description :   This method is used for validating raw file name based on the regex pattern
+        Method Name :   get_changed_files
+        Description :   This method is used for getting the raw files which are not in the validation manifest,
+                        or whose etag changed since they were validated
+        Output      :   List of (file name, etag) tuples
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.validate_raw_file_name.__name__
+        method_name = self.get_changed_files.__name__
 
         self.log_writer.start_log(
             key="start",
@@ -197,86 +205,100 @@ class Raw_Pred_Data_Validation:
         )
 
         try:
-            onlyfiles = self.blob.get_files_from_folder(
-                folder_name=self.raw_pred_data_dir,
-                container_name=self.raw_data_container_name,
-                db_name=self.db_name,
-                collection_name=self.pred_name_valid_log,
+            self.db_op.create_index(
+                db_name=self.manifest_db_name,
+                collection_name=self.pred_validation_manifest,
+                key="file_name",
+                unique=True,
+            )
+
+            records = self.db_op.find_records(
+                db_name=self.manifest_db_name,
+                collection_name=self.pred_validation_manifest,
+                query={"file_name": {"$in": [f[0] for f in files]}},
+                projection={"_id": 0, "file_name": 1, "etag": 1},
             )
 
-            pred_batch_files = [f.split("/")[1] for f in onlyfiles]
+            validated = {r["file_name"]: r["etag"] for r in records}
+
+            changed_files = [f for f in files if validated.get(f[0]) != f[1]]
 
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.pred_name_valid_log,
-                log_info="Got prediction files with exact name",
+                log_info=f"{len(changed_files)} of {len(files)} raw files are new or changed",
             )
 
-            for filename in pred_batch_files:
-                raw_data_pred_filename = self.raw_pred_data_dir + "/" + filename
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.pred_name_valid_log,
+            )
 
-                good_data_pred_filename = self.good_pred_data_dir + "/" + filename
+            return changed_files
 
-                bad_data_pred_filename = self.bad_pred_data_dir + "/" + filename
+        except Exception as e:
+            self.log_writer.exception_log(
+                error=e,
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.pred_name_valid_log,
+            )
 
-                self.log_writer.log(
-                    db_name=self.db_name,
-                    collection_name=self.pred_name_valid_log,
-                    log_info="Created raw,good and bad data filenames",
-                )
+    def record_verdicts(self, verdicts, collection_name):
+        """
+        Method Name :   record_verdicts
+        Description :   This method is used for recording the (file name, verdict, reason) verdicts of the raw files
+                        found by validate_raw_file_name in the validation manifest, along with their etags
 
-                if re.match(regex, filename):
-                    splitAtDot = re.split(".csv", filename)
-
-                    splitAtDot = re.split("_", splitAtDot[0])
-
-                    if len(splitAtDot[1]) == LengthOfDateStampInFile:
-                        if len(splitAtDot[2]) == LengthOfTimeStampInFile:
-                            self.blob.copy_data(
-                                from_file_name=raw_data_pred_filename,
-                                from_container_name=self.pred_data_container,
-                                to_file_name=good_data_pred_filename,
-                                to_container_name=self.pred_data_container,
-                                db_name=self.db_name,
-                                collection_name=self.pred_name_valid_log,
-                            )
-
-                        else:
-                            self.blob.copy_data(
-                                from_file_name=raw_data_pred_filename,
-                                from_container_name=self.raw_data_container_name,
-                                to_file_name=bad_data_pred_filename,
-                                to_container_name=self.pred_data_container,
-                                db_name=self.db_name,
-                                collection_name=self.pred_name_valid_log,
-                            )
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.record_verdicts.__name__
 
-                    else:
-                        self.blob.copy_data(
-                            from_file_name=raw_data_pred_filename,
-                            from_container_name=self.raw_data_container_name,
-                            to_file_name=bad_data_pred_filename,
-                            to_container_name=self.pred_data_container,
-                            db_name=self.db_name,
-                            collection_name=self.pred_name_valid_log,
-                        )
+        self.log_writer.start_log(
+            key="start",
+            class_name=self.class_name,
+            method_name=method_name,
+            db_name=self.db_name,
+            collection_name=collection_name,
+        )
 
-                else:
-                    self.blob.copy_data(
-                        from_file_name=raw_data_pred_filename,
-                        from_container_name=self.pred_data_container,
-                        to_file_name=bad_data_pred_filename,
-                        to_container_name=self.pred_data_container,
-                        db_name=self.db_name,
-                        collection_name=self.pred_name_valid_log,
-                    )
+        try:
+            records = [
+                {
+                    "file_name": self.new_files[filename][0],
+                    "etag": self.new_files[filename][1],
+                    "verdict": verdict,
+                    "reason": reason,
+                    "validated_at": datetime.utcnow(),
+                }
+                for filename, verdict, reason in verdicts
+                if filename in self.new_files
+            ]
+
+            self.db_op.upsert_records(
+                db_name=self.manifest_db_name,
+                collection_name=self.pred_validation_manifest,
+                data=records,
+                key="file_name",
+            )
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=collection_name,
+                log_info=f"Recorded {len(records)} verdicts in validation manifest",
+            )
 
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
                 method_name=method_name,
                 db_name=self.db_name,
-                collection_name=self.pred_name_valid_log,
+                collection_name=collection_name,
             )
 
         except Exception as e:
@@ -285,103 +307,178 @@ class Raw_Pred_Data_Validation:
                 class_name=self.class_name,
                 method_name=method_name,
                 db_name=self.db_name,
-                collection_name=self.pred_name_valid_log,
+                collection_name=collection_name,
             )
 
-    def validate_col_length(self, NumberofColumns):
+    def record_good_files(self, lst):
         """
-        Method Name :   validate_col_length
-        Description :   This method is used for validating the column length of the csv file
+        Method Name :   record_good_files
+        Description :   This method is used for recording the good verdicts of the (dataframe, file, file name)
+                        tuples in the validation manifest, it is called only after the files are ingested so that
+                        a failed ingestion is retried on the next run
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.validate_col_length.__name__
+        self.record_verdicts(
+            verdicts=[(f[2], "good", None) for f in lst],
+            collection_name=self.pred_col_valid_log,
+        )
+
+    def validate_raw_file_name(
+        self, regex, LengthOfDateStampInFile, LengthOfTimeStampInFile
+    ):
+        """
+        Method Name :   validate_raw_file_name
+        Description :   This method is used for validating raw file name based on the regex pattern and the date
+                        and time stamp lengths, all the file names are checked in one pass against a single
+                        compiled pattern. Only the files which are new or changed since the last validation are
+                        processed
+        Output      :   List of good data files copied in this run
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.validate_raw_file_name.__name__
 
         self.log_writer.start_log(
             key="start",
             class_name=self.class_name,
             method_name=method_name,
             db_name=self.db_name,
-            collection_name=self.pred_col_valid_log,
+            collection_name=self.pred_name_valid_log,
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
-                folder_name=self.good_pred_data_dir,
-                container_name=self.pred_data_container,
+            onlyfiles = self.blob.get_files_with_etags_from_folder(
+                folder_name=self.raw_pred_data_dir,
+                container_name=self.raw_data_container_name,
                 db_name=self.db_name,
-                collection_name=self.pred_col_valid_log,
+                collection_name=self.pred_name_valid_log,
             )
 
-            for f in lst:
-                df = f[0]
+            changed_files = self.get_changed_files(onlyfiles)
 
-                file = f[1]
+            self.new_files = {f[0].split("/")[1]: f for f in changed_files}
 
-                abs_f = f[2]
+            pred_batch_files = list(self.new_files)
 
-                if file.endswith(".csv"):
-                    if df.shape[1] == NumberofColumns:
-                        pass
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.pred_name_valid_log,
+                log_info="Got prediction files with exact name",
+            )
 
-                    else:
-                        dest_f = self.bad_pred_data_dir + "/" + abs_f
-
-                        self.blob.move_data(
-                            from_file_name=file,
-                            from_container_name=self.pred_data_container,
-                            to_file_name=dest_f,
-                            to_container_name=self.pred_data_container,
-                            db_name=self.db_name,
-                            collection_name=self.pred_col_valid_log,
-                        )
+            good_names, bad_names = classify_file_names(
+                file_names=pred_batch_files,
+                regex=regex,
+                LengthOfDateStampInFile=LengthOfDateStampInFile,
+                LengthOfTimeStampInFile=LengthOfTimeStampInFile,
+            )
 
-                else:
-                    pass
+            good_files = [
+                (
+                    self.raw_pred_data_dir + "/" + filename,
+                    self.good_pred_data_dir + "/" + filename,
+                )
+                for filename in good_names
+            ]
+
+            bad_files = [
+                (
+                    self.raw_pred_data_dir + "/" + filename,
+                    self.bad_pred_data_dir + "/" + filename,
+                )
+                for filename, _ in bad_names
+            ]
+
+            verdicts = [(filename, "bad", reason) for filename, reason in bad_names]
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.pred_name_valid_log,
+                log_info=f"Found {len(good_files)} good and {len(bad_files)} bad files",
+            )
+
+            good_files, bad_files = [
+                self.blob.copy_files(
+                    files=files,
+                    from_container_name=self.raw_data_container_name,
+                    to_container_name=self.pred_data_container,
+                    db_name=self.db_name,
+                    collection_name=self.pred_name_valid_log,
+                )
+                for files in [good_files, bad_files]
+            ]
+
+            copied = set(f[1].split("/")[-1] for f in bad_files)
+
+            self.record_verdicts(
+                verdicts=[v for v in verdicts if v[0] in copied],
+                collection_name=self.pred_name_valid_log,
+            )
 
             self.log_writer.start_log(
                 key="exit",
                 class_name=self.class_name,
                 method_name=method_name,
                 db_name=self.db_name,
-                collection_name=self.pred_col_valid_log,
+                collection_name=self.pred_name_valid_log,
             )
 
+            return [f[1] for f in good_files]
+
         except Exception as e:
             self.log_writer.exception_log(
                 error=e,
                 class_name=self.class_name,
                 method_name=method_name,
                 db_name=self.db_name,
-                collection_name=self.pred_col_valid_log,
+                collection_name=self.pred_name_valid_log,
             )
 
-    def validate_missing_values_in_col(self):
+    def validate_good_data(self, NumberofColumns, files=None):
         """
-        Method Name :   validate_missing_values_in_col
-        Description :   This method is used for validating the missing values in columns
+        Method Name :   validate_good_data
+        Description :   This method is used for validating the column length and the missing values in columns
+                        of the good data in a single pass, every file is read once and the bad files are moved
+                        to the bad data folder once. When files is given only those good data files are
+                        validated, otherwise the whole good data folder is validated
+                        Only the bad verdicts are recorded here, the good ones are recorded by record_good_files
+                        once the files are ingested
+        Output      :   List of (dataframe, file, file name) tuples of the files which passed the validation
 
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
-        method_name = self.validate_missing_values_in_col.__name__
+        method_name = self.validate_good_data.__name__
 
         self.log_writer.start_log(
             key="start",
             class_name=self.class_name,
             method_name=method_name,
             db_name=self.db_name,
-            collection_name=self.pred_missing_value_log,
+            collection_name=self.pred_col_valid_log,
         )
 
         try:
-            lst = self.blob.read_csv_from_folder(
-                folder_name=self.good_pred_data_dir,
-                container_name=self.pred_data_container,
-                db_name=self.db_name,
-                collection_name=self.pred_missing_value_log,
-            )
+            if files is None:
+                lst = self.blob.read_csv_from_folder(
+                    folder_name=self.good_pred_data_dir,
+                    container_name=self.pred_data_container,
+                    db_name=self.db_name,
+                    collection_name=self.pred_col_valid_log,
+                )
+
+            else:
+                lst = self.blob.read_csv_files(
+                    files=files,
+                    container_name=self.pred_data_container,
+                    db_name=self.db_name,
+                    collection_name=self.pred_col_valid_log,
+                )
+
+            good_lst, bad_files, verdicts = [], [], []
 
             for f in lst:
                 df = f[0]
@@ -390,48 +487,64 @@ class Raw_Pred_Data_Validation:
 
                 abs_f = f[2]
 
-                if abs_f.endswith(".csv"):
-                    count = 0
+                if file.endswith(".csv"):
+                    null_cols = df.columns[df.isna().all()].to_list()
+
+                    if df.shape[1] != NumberofColumns:
+                        reason = (
+                            f"has {df.shape[1]} columns, expected {NumberofColumns}"
+                        )
 
-                    for cols in df:
-                        if (len(df[cols]) - df[cols].count()) == len(df[cols]):
-                            count += 1
+                    elif len(null_cols) > 0:
+                        reason = f"has all the values missing in {null_cols} columns"
 
-                            dest_f = self.bad_pred_data_dir + "/" + abs_f
+                    else:
+                        good_lst.append(f)
 
-                            self.blob.move_data(
-                                from_file_name=file,
-                                from_container_name=self.pred_data_container,
-                                to_file_name=dest_f,
-                                to_container_name=self.pred_data_container,
-                                db_name=self.db_name,
-                                collection_name=self.pred_missing_value_log,
-                            )
+                        continue
 
-                            break
+                    verdicts.append((abs_f, "bad", reason))
+
+                    self.log_writer.log(
+                        db_name=self.db_name,
+                        collection_name=self.pred_col_valid_log,
+                        log_info=f"{file} file {reason}, moving it to bad data folder",
+                    )
 
-                    if count == 0:
-                        dest_f = self.good_pred_data_dir + "/" + abs_f
+                    dest_f = self.bad_pred_data_dir + "/" + abs_f
 
-                        self.blob.upload_df_as_csv(
-                            dataframe=df,
-                            local_file_name=abs_f,
-                            container_file_name=dest_f,
-                            container_name=self.pred_data_container,
-                            db_name=self.db_name,
-                            collection_name=self.pred_missing_value_log,
-                        )
+                    bad_files.append((file, dest_f))
 
                 else:
                     pass
 
-                self.log_writer.start_log(
-                    key="exit",
-                    class_name=self.class_name,
-                    method_name=method_name,
-                    db_name=self.db_name,
-                    collection_name=self.pred_missing_value_log,
-                )
+            self.blob.move_files(
+                files=bad_files,
+                from_container_name=self.pred_data_container,
+                to_container_name=self.pred_data_container,
+                db_name=self.db_name,
+                collection_name=self.pred_col_valid_log,
+            )
+
+            self.record_verdicts(
+                verdicts=verdicts, collection_name=self.pred_col_valid_log
+            )
+
+            self.log_writer.log(
+                db_name=self.db_name,
+                collection_name=self.pred_col_valid_log,
+                log_info=f"{len(good_lst)} of {len(lst)} files passed the column length and missing values validation",
+            )
+
+            self.log_writer.start_log(
+                key="exit",
+                class_name=self.class_name,
+                method_name=method_name,
+                db_name=self.db_name,
+                collection_name=self.pred_col_valid_log,
+            )
+
+            return good_lst
 
         except Exception as e:
             self.log_writer.exception_log(
@@ -439,5 +552,5 @@ class Raw_Pred_Data_Validation:
                 class_name=self.class_name,
                 method_name=method_name,
                 db_name=self.db_name,
-                collection_name=self.pred_missing_value_log,
+                collection_name=self.pred_col_valid_log,
             )
@@ -62,13 +62,13 @@ class Pred_Validation:
 
             regex = self.raw_data.get_regex_pattern()
 
-            self.raw_data.validate_raw_file_name(
+            good_files = self.raw_data.validate_raw_file_name(
                 regex, LengthOfDateStampInFile, LengthOfTimeStampInFile
             )
 
-            self.raw_data.validate_col_length(NumberofColumns=noofcolumns)
-
-            self.raw_data.validate_missing_values_in_col()
+            good_data = self.raw_data.validate_good_data(
+                NumberofColumns=noofcolumns, files=good_files
+            )
 
             self.log_writer.log(
                 db_name=self.db_name,
@@ -82,7 +82,7 @@ class Pred_Validation:
                 log_info="Starting Data Transformation",
             )
 
-            self.data_transform.add_quotes_to_string()
+            good_data = self.data_transform.add_quotes_to_string(lst=good_data)
 
             self.log_writer.log(
                 db_name=self.db_name,
@@ -91,10 +91,13 @@ class Pred_Validation:
             )
 
             self.db_operation.insert_good_data_as_record(
-                db_name=self.good_data_db_name,
-                collection_name=self.good_data_collection_name,
+                good_data_db_name=self.good_data_db_name,
+                good_data_collection_name=self.good_data_collection_name,
+                lst=good_data,
             )
 
+            self.raw_data.record_good_files(lst=good_data)
+
             self.log_writer.log(
                 db_name=self.db_name,
                 collection_name=self.pred_main_log,
@@ -102,8 +105,8 @@ class Pred_Validation:
             )
 
             self.db_operation.export_collection_to_csv(
-                db_name=self.good_data_db_name,
-                collection_name=self.good_data_collection_name,
+                good_data_db_name=self.good_data_db_name,
+                good_data_collection_name=self.good_data_collection_name,
             )
 
             self.log_writer.start_log(
@@ -0,0 +1,149 @@
+import os
+from unittest.mock import MagicMock
+
+from phising.blob_storage_operations import blob_cache
+from phising.blob_storage_operations.blob_cache import Blob_Cache
+from phising.blob_storage_operations.blob_operations import Blob_Operation
+from phising.blob_storage_operations.storage_backends import Local_Storage_Backend
+
+
+class Remote_Local_Storage_Backend(Local_Storage_Backend):
+    remote = True
+
+
+def get_blob_cache(cache_dir, monkeypatch):
+    config = {
+        "blob_cache": {"dir": str(cache_dir), "max_size_mb": 1, "lock_timeout": 5}
+    }
+
+    monkeypatch.setattr(blob_cache, "read_params", lambda: config)
+
+    return Blob_Cache()
+
+
+def get_blob_operation(storage, cache):
+    blob = Blob_Operation.__new__(Blob_Operation)
+
+    blob.class_name = Blob_Operation.__name__
+
+    blob.log_writer = MagicMock()
+
+    blob.storage = storage
+
+    blob.blob_cache = cache
+
+    return blob
+
+
+def test_read_blob_revalidates_cached_content_with_etag(tmp_path, monkeypatch):
+    storage = Remote_Local_Storage_Backend(root_dir=tmp_path / "storage")
+
+    cache = get_blob_cache(tmp_path / "cache", monkeypatch)
+
+    blob = get_blob_operation(storage, cache)
+
+    downloads = []
+
+    def get_file(container_name, file_name, etag=None):
+        content, new_etag = Local_Storage_Backend.get_file(
+            storage, container_name, file_name, etag=etag
+        )
+
+        downloads.append(content is not None)
+
+        return content, new_etag
+
+    storage.get_file = get_file
+
+    storage.put_file("container", "schema.json", b"{}")
+
+    read_func = lambda: blob.read_blob(
+        file_name="schema.json",
+        container_name="container",
+        db_name="db",
+        collection_name="collection",
+    )
+
+    assert read_func() == b"{}"
+
+    assert read_func() == b"{}"
+
+    assert downloads == [True, False]
+
+    storage.put_file("container", "schema.json", b'{"a": 1}')
+
+    assert read_func() == b'{"a": 1}'
+
+    assert downloads == [True, False, True]
+
+    assert cache.read("container", "schema.json") == b'{"a": 1}'
+
+
+def test_read_blob_downloads_again_when_cached_content_is_gone(tmp_path, monkeypatch):
+    storage = Remote_Local_Storage_Backend(root_dir=tmp_path / "storage")
+
+    cache = get_blob_cache(tmp_path / "cache", monkeypatch)
+
+    blob = get_blob_operation(storage, cache)
+
+    storage.put_file("container", "schema.json", b"{}")
+
+    blob.read_blob("schema.json", "container", "db", "collection")
+
+    digest = cache.index["container/schema.json"]["digest"]
+
+    os.remove(cache.get_content_path(digest))
+
+    assert cache.read("container", "schema.json") is None
+
+    assert "container/schema.json" not in cache.index
+
+    assert blob.read_blob("schema.json", "container", "db", "collection") == b"{}"
+
+    assert cache.read("container", "schema.json") == b"{}"
+
+
+def test_put_evicts_least_recently_used_entries(tmp_path, monkeypatch):
+    cache = get_blob_cache(tmp_path / "cache", monkeypatch)
+
+    cache.max_size = 10
+
+    cache.put("container", "a", '"a"', b"aaaa")
+
+    cache.put("container", "b", '"b"', b"bbbb")
+
+    assert cache.read("container", "a") == b"aaaa"
+
+    cache.put("container", "c", '"c"', b"cccc")
+
+    assert cache.read("container", "b") is None
+
+    assert cache.get_etag("container", "b") is None
+
+    assert cache.read("container", "a") == b"aaaa"
+
+    assert cache.read("container", "c") == b"cccc"
+
+    digests = [name for name in os.listdir(cache.cache_dir) if len(name) == 64]
+
+    assert sorted(digests) == sorted(e["digest"] for e in cache.index.values())
+
+
+def test_put_merges_index_of_other_processes(tmp_path, monkeypatch):
+    first = get_blob_cache(tmp_path / "cache", monkeypatch)
+
+    second = get_blob_cache(tmp_path / "cache", monkeypatch)
+
+    first.put("container", "a", '"a"', b"aaaa")
+
+    second.put("container", "b", '"b"', b"bbbb")
+
+    assert second.read("container", "a") == b"aaaa"
+
+    assert sorted(second.load_index()) == ["container/a", "container/b"]
+
+    assert first.read("container", "a") == b"aaaa"
+
+    first.close()
+
+    assert sorted(first.load_index()) == ["container/a", "container/b"]
@@ -0,0 +1,86 @@
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from phising.blob_storage_operations.blob_operations import Blob_Operation
+
+
+def get_blob_operation(uploads):
+    blob = Blob_Operation.__new__(Blob_Operation)
+
+    blob.class_name = Blob_Operation.__name__
+
+    blob.log_writer = MagicMock()
+
+    blob.parquet_ext = ".parquet"
+
+    def upload_data(data, container_file_name, **kwargs):
+        data.seek(0)
+
+        uploads[container_file_name] = data.read()
+
+    blob.upload_data = upload_data
+
+    return blob
+
+
+def test_upload_df_in_batches_uses_schema_dtypes_for_all_batches():
+    uploads = {}
+
+    blob = get_blob_operation(uploads)
+
+    batches = [
+        pd.DataFrame({"a": [-1, 0, 1], "b": [None, None, None]}),
+        pd.DataFrame({"a": [100, -100, None], "b": [0.5, 1.0, None]}),
+    ]
+
+    n_rows = blob.upload_df_in_batches(
+        dataframes=iter(batches),
+        dtypes={"a": "int8", "b": "float32"},
+        container_file_name="export.parquet",
+        container_name="container",
+        db_name="db",
+        collection_name="collection",
+    )
+
+    table = pq.read_table(BytesIO(uploads["export.parquet"]))
+
+    assert n_rows == 6
+
+    assert table.schema.field("a").type == pa.int8()
+
+    assert table.schema.field("b").type == pa.float32()
+
+    assert table.column("a").to_pylist() == [-1, 0, 1, 100, -100, None]
+
+    assert table.column("b").to_pylist() == [None, None, None, 0.5, 1.0, None]
+
+
+def test_upload_df_in_batches_keeps_undeclared_columns():
+    uploads = {}
+
+    blob = get_blob_operation(uploads)
+
+    batches = [
+        pd.DataFrame({"phising": ["x", "y"], "a": ["1", "?"]}),
+        pd.DataFrame({"phising": ["z"], "a": [0]}),
+    ]
+
+    blob.upload_df_in_batches(
+        dataframes=iter(batches),
+        dtypes={"a": "int8"},
+        container_file_name="export.parquet",
+        container_name="container",
+        db_name="db",
+        collection_name="collection",
+    )
+
+    table = pq.read_table(BytesIO(uploads["export.parquet"]))
+
+    assert table.schema.field("phising").type == pa.string()
+
+    assert table.column("phising").to_pylist() == ["x", "y", "z"]
+
+    assert table.column("a").to_pylist() == [1, None, 0]
@@ -0,0 +1,41 @@
+from utils.file_name_utils import classify_file_names
+
+regex = r"phising_\d+_\d+\.csv"
+
+
+def test_classify_file_names_accepts_valid_file_names():
+    good, bad = classify_file_names(
+        ["phising_08012020_120000.csv", "phising_31122021_235959.csv"], regex, 8, 6
+    )
+
+    assert good == ["phising_08012020_120000.csv", "phising_31122021_235959.csv"]
+
+    assert bad == []
+
+
+def test_classify_file_names_gives_reason_for_bad_file_names():
+    good, bad = classify_file_names(
+        [
+            "phising_08012020_120000.csv",
+            "wafer_08012020_120000.csv",
+            "phising_0801202_120000.csv",
+            "phising_08012020_12000.csv",
+            "phising.csv",
+        ],
+        regex,
+        8,
+        6,
+    )
+
+    assert good == ["phising_08012020_120000.csv"]
+
+    assert bad == [
+        ("wafer_08012020_120000.csv", "file name does not match regex"),
+        ("phising_0801202_120000.csv", "invalid date stamp length"),
+        ("phising_08012020_12000.csv", "invalid time stamp length"),
+        ("phising.csv", "file name does not match regex"),
+    ]
+
+
+def test_classify_file_names_handles_no_files():
+    assert classify_file_names([], regex, 8, 6) == ([], [])
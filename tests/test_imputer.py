@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from phising.data_preprocessing.imputer import Imputer
+
+
+def test_mean_imputer_drops_sparse_columns_and_fills_with_fitted_means():
+    data = pd.DataFrame(
+        {
+            "a": [1.0, 2.0, np.nan, 3.0],
+            "b": [np.nan, np.nan, np.nan, 1.0],
+            "c": [1, 2, 3, 4],
+        }
+    )
+
+    imputer = Imputer(strategy="mean", null_threshold=0.5, estimator_dtype="float32")
+
+    imputer.fit(data)
+
+    assert imputer.columns == ["a", "c"]
+
+    assert imputer.dropped_columns == ["b"]
+
+    assert imputer.means == {"a": 2.0, "c": 2.5}
+
+    result = imputer.transform(
+        pd.DataFrame({"c": [np.nan, 5], "b": [1.0, 2.0], "id": ["x", "y"]})
+    )
+
+    assert result.columns.to_list() == ["id", "a", "c"]
+
+    assert result["a"].to_list() == [2.0, 2.0]
+
+    assert result["c"].to_list() == [2.5, 5.0]
+
+    assert result.dtypes.to_dict() == {
+        "id": np.dtype(object),
+        "a": np.dtype("float32"),
+        "c": np.dtype("float32"),
+    }
+
+
+def test_mean_imputer_keeps_fitted_dtypes_without_missing_values():
+    data = pd.DataFrame({"a": [1.0, np.nan], "c": [1, 2]})
+
+    imputer = Imputer(strategy="mean", null_threshold=0.6, estimator_dtype="float32")
+
+    result = imputer.fit(data).transform(pd.DataFrame({"a": [4.0], "c": [7]}))
+
+    assert result["a"].dtype == np.dtype("float32")
+
+    assert result["c"].dtype == np.dtype("int64")
+
+    assert result.to_dict(orient="list") == {"a": [4.0], "c": [7]}
+
+
+def test_knn_imputer_fills_only_missing_rows_in_batches():
+    data = pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0, np.nan], "b": [10, 20, 30, 40, 50]})
+
+    imputer = Imputer(
+        strategy="knn",
+        null_threshold=0.5,
+        estimator_dtype="float32",
+        knn_params={"n_neighbors": 2},
+        batch_size=1,
+        n_jobs=1,
+    )
+
+    imputer.fit(data)
+
+    result = imputer.transform(
+        pd.DataFrame({"a": [np.nan, 1.25, np.nan], "b": [11, 15, 39]})
+    )
+
+    assert result["a"].to_list() == [1.5, 1.25, 3.5]
+
+    assert result["b"].to_list() == [11, 15, 39]
+
+    assert result["b"].dtype == np.dtype("int64")
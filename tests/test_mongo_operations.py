@@ -0,0 +1,237 @@
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+from phising.data_type_valid.data_type_valid_train import DB_Operation_Train
+from phising.mongo_db_operations.mongo_operations import MongoDB_Operation
+from pymongo.errors import DuplicateKeyError
+from utils.hash_utils import get_dataframe_hash
+
+
+class Fake_Collection:
+    def __init__(self):
+        self.records = []
+
+        self.batches = []
+
+        self.unique_keys = []
+
+        self.lock = threading.Lock()
+
+    def is_match(self, record, query):
+        for key, value in query.items():
+            if isinstance(value, dict):
+                if not record.get(key, value["$lt"]) < value["$lt"]:
+                    return False
+
+            elif record.get(key) != value:
+                return False
+
+        return True
+
+    def create_index(self, key, unique=False):
+        if unique:
+            self.unique_keys.append(key)
+
+    def insert_one(self, record):
+        with self.lock:
+            for key in self.unique_keys:
+                if any(r.get(key) == record[key] for r in self.records):
+                    raise DuplicateKeyError(f"duplicate {key}")
+
+            self.records.append(dict(record))
+
+    def insert_many(self, records, ordered=True):
+        with self.lock:
+            self.batches.append(len(records))
+
+            self.records.extend(dict(r) for r in records)
+
+        return SimpleNamespace(inserted_ids=list(range(len(records))))
+
+    def update_one(self, query, update):
+        with self.lock:
+            for record in self.records:
+                if self.is_match(record, query):
+                    record.update(update["$set"])
+
+                    return SimpleNamespace(modified_count=1)
+
+        return SimpleNamespace(modified_count=0)
+
+    def delete_many(self, query):
+        with self.lock:
+            kept = [r for r in self.records if not self.is_match(r, query)]
+
+            deleted_count = len(self.records) - len(kept)
+
+            self.records = kept
+
+        return SimpleNamespace(deleted_count=deleted_count)
+
+
+def get_mongo_operation(insert_batch_size=2, insert_workers=2):
+    db_op = MongoDB_Operation.__new__(MongoDB_Operation)
+
+    db_op.class_name = MongoDB_Operation.__name__
+
+    db_op.insert_batch_size = insert_batch_size
+
+    db_op.insert_workers = insert_workers
+
+    db_op.client = defaultdict(lambda: defaultdict(Fake_Collection))
+
+    return db_op
+
+
+def get_db_operation(db_op):
+    db_operation = DB_Operation_Train.__new__(DB_Operation_Train)
+
+    db_operation.class_name = DB_Operation_Train.__name__
+
+    db_operation.db_name = "log_db"
+
+    db_operation.train_db_insert_log = "db_insert_log"
+
+    db_operation.train_manifest_collection = "manifest"
+
+    db_operation.manifest_claim_timeout = 3600
+
+    db_operation.log_writer = MagicMock()
+
+    db_operation.db_op = db_op
+
+    return db_operation
+
+
+def test_insert_dataframe_as_record_inserts_in_batches():
+    for insert_workers in (1, 3):
+        db_op = get_mongo_operation(insert_batch_size=2, insert_workers=insert_workers)
+
+        df = pd.DataFrame({"a": [1.0, np.nan, 3.0, 4.0, 5.0], "b": list("vwxyz")})
+
+        inserted = db_op.insert_dataframe_as_record(
+            data_frame=df, db_name="db", collection_name="data"
+        )
+
+        collection = db_op.client["db"]["data"]
+
+        assert inserted == 5
+
+        assert sorted(collection.batches) == [1, 2, 2]
+
+        assert sorted(collection.records, key=lambda r: r["b"]) == [
+            {"a": 1.0, "b": "v"},
+            {"a": None, "b": "w"},
+            {"a": 3.0, "b": "x"},
+            {"a": 4.0, "b": "y"},
+            {"a": 5.0, "b": "z"},
+        ]
+
+
+def test_insert_good_data_as_record_skips_ingested_content():
+    db_op = get_mongo_operation()
+
+    db_operation = get_db_operation(db_op)
+
+    df_1 = pd.DataFrame({"a": [1, 2, 3]})
+
+    df_2 = pd.DataFrame({"a": [4, 5]})
+
+    lst = [
+        (df_1, "phising_1.csv", "phising_1"),
+        (df_1.copy(), "phising_1_copy.csv", "phising_1_copy"),
+        (df_2, "phising_2.csv", "phising_2"),
+        (df_2, "phising_2.txt", "phising_2"),
+    ]
+
+    for _ in range(2):
+        db_operation.insert_good_data_as_record("db", "data", lst=lst)
+
+    data = db_op.client["db"]["data"].records
+
+    manifest = db_op.client["db"]["manifest"].records
+
+    assert sorted(r["a"] for r in data) == [1, 2, 3, 4, 5]
+
+    assert {r["file_hash"] for r in data} == {
+        get_dataframe_hash(df_1),
+        get_dataframe_hash(df_2),
+    }
+
+    assert sorted((r["file_name"], r["status"], r["row_count"]) for r in manifest) == [
+        ("phising_1.csv", "complete", 3),
+        ("phising_2.csv", "complete", 2),
+    ]
+
+    db_operation.log_writer.exception_log.assert_not_called()
+
+
+def test_insert_good_data_as_record_retries_stale_claims_only():
+    db_op = get_mongo_operation()
+
+    db_operation = get_db_operation(db_op)
+
+    stale_df = pd.DataFrame({"a": [1, 2]})
+
+    claimed_df = pd.DataFrame({"a": [3, 4]})
+
+    stale_hash = get_dataframe_hash(stale_df)
+
+    claimed_hash = get_dataframe_hash(claimed_df)
+
+    manifest = db_op.client["db"]["manifest"]
+
+    manifest.unique_keys.append("file_hash")
+
+    manifest.records = [
+        {
+            "file_hash": stale_hash,
+            "status": "pending",
+            "claimed_at": datetime.utcnow() - timedelta(hours=2),
+        },
+        {
+            "file_hash": claimed_hash,
+            "status": "pending",
+            "claimed_at": datetime.utcnow(),
+        },
+    ]
+
+    db_op.client["db"]["data"].records = [{"a": 1, "file_hash": stale_hash}]
+
+    db_operation.insert_good_data_as_record(
+        "db",
+        "data",
+        lst=[
+            (stale_df, "phising_1.csv", "phising_1"),
+            (claimed_df, "phising_2.csv", "phising_2"),
+        ],
+    )
+
+    data = db_op.client["db"]["data"].records
+
+    assert sorted(r["a"] for r in data) == [1, 2]
+
+    assert [r["status"] for r in manifest.records] == ["complete", "pending"]
+
+
+def test_insert_good_data_as_record_releases_claim_on_failure():
+    db_op = get_mongo_operation()
+
+    db_operation = get_db_operation(db_op)
+
+    data = db_op.client["db"]["data"]
+
+    data.insert_many = MagicMock(side_effect=Exception("insert failed"))
+
+    db_operation.insert_good_data_as_record(
+        "db", "data", lst=[(pd.DataFrame({"a": [1]}), "phising_1.csv", "phising_1")]
+    )
+
+    assert db_op.client["db"]["manifest"].records == []
+
+    db_operation.log_writer.exception_log.assert_called_once()
@@ -0,0 +1,95 @@
+import os
+
+from phising.blob_storage_operations.storage_backends import Local_Storage_Backend
+
+
+def test_local_backend_put_and_get_file(tmp_path):
+    storage = Local_Storage_Backend(root_dir=tmp_path)
+
+    assert storage.create_container("container") is True
+
+    assert storage.create_container("container") is False
+
+    storage.put_file("container", "folder/file.csv", b"a,b\n1,2\n")
+
+    content, etag = storage.get_file("container", "folder/file.csv")
+
+    assert content == b"a,b\n1,2\n"
+
+    assert storage.exists("container", "folder/file.csv") is True
+
+    assert storage.exists("container", "folder/other.csv") is False
+
+    assert storage.get_file("container", "folder/file.csv", etag=etag) == (None, etag)
+
+
+def test_local_backend_etag_changes_when_file_is_replaced(tmp_path):
+    storage = Local_Storage_Backend(root_dir=tmp_path)
+
+    storage.put_file("container", "file.csv", b"old")
+
+    _, old_etag = storage.get_file("container", "file.csv")
+
+    storage.put_file("container", "file.csv", b"new content")
+
+    content, new_etag = storage.get_file("container", "file.csv", etag=old_etag)
+
+    assert content == b"new content"
+
+    assert new_etag != old_etag
+
+
+def test_local_backend_lists_files_by_prefix_without_temp_files(tmp_path):
+    storage = Local_Storage_Backend(root_dir=tmp_path)
+
+    storage.put_file("container", "good/a.csv", b"a")
+
+    storage.put_file("container", "good/b.csv", b"b")
+
+    storage.put_file("container", "bad/c.csv", b"c")
+
+    storage.get_tmp_path(storage.get_path("container", "good/d.csv"))
+
+    assert storage.list_files("container", "good/") == ["good/a.csv", "good/b.csv"]
+
+    assert [f for f, _ in storage.list_files_with_etags("container", "")] == [
+        "bad/c.csv",
+        "good/a.csv",
+        "good/b.csv",
+    ]
+
+
+def test_local_backend_copy_move_and_delete_files(tmp_path):
+    storage = Local_Storage_Backend(root_dir=tmp_path)
+
+    storage.put_file("src", "a.csv", b"a")
+
+    storage.put_file("src", "b.csv", b"b")
+
+    copied, pending = storage.copy_files([("a.csv", "x/a.csv")], "src", "dest")
+
+    assert copied == [("a.csv", "x/a.csv")]
+
+    assert pending == []
+
+    assert storage.get_file("dest", "x/a.csv")[0] == b"a"
+
+    assert storage.exists("src", "a.csv") is True
+
+    storage.move_files([("b.csv", "x/b.csv")], "src", "dest")
+
+    assert storage.exists("src", "b.csv") is False
+
+    assert storage.get_file("dest", "x/b.csv")[0] == b"b"
+
+    assert storage.delete_files("dest", ["x/a.csv", "x/b.csv"]) == 2
+
+    assert storage.list_files("dest", "") == []
+
+    assert storage.list_files("src", "") == ["a.csv"]
+
+    assert not any(
+        name.startswith(storage.tmp_prefix)
+        for _, _, names in os.walk(tmp_path)
+        for name in names
+    )
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from utils.read_params import read_params
+
+
+def get_schema_dtypes(column_names):
+    """
+    Method Name :   get_schema_dtypes
+    Description :   This method is used for mapping the column types declared in the schema file (ColName)
+                    to the compact storage dtypes from params.yaml
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = get_schema_dtypes.__name__
+
+    try:
+        schema_dtypes = read_params()["dtypes"]["schema"]
+
+        return {
+            col: schema_dtypes[col_type]
+            for col, col_type in column_names.items()
+            if col_type in schema_dtypes
+        }
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
+
+
+def fits_dtype(values, dtype):
+    """
+    Method Name :   fits_dtype
+    Description :   This method is used for checking whether the numeric values can be stored in the dtype
+                    without loss, integer dtypes need complete, integral values within the dtype range
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    dtype = np.dtype(dtype)
+
+    if dtype.kind not in "iu":
+        return True
+
+    if values.isna().any():
+        return False
+
+    info = np.iinfo(dtype)
+
+    return bool(
+        values.min() >= info.min
+        and values.max() <= info.max
+        and (values == np.round(values)).all()
+    )
+
+
+def to_storage_dtypes(data, dtypes):
+    """
+    Method Name :   to_storage_dtypes
+    Description :   This method is used for converting the columns to their declared compact dtypes, the values
+                    which are not numeric become NaN and the columns which can not be stored in the declared
+                    dtype are stored in the estimator dtype
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = to_storage_dtypes.__name__
+
+    try:
+        estimator_dtype = read_params()["dtypes"]["estimator"]
+
+        data = data.copy()
+
+        for col, dtype in dtypes.items():
+            if col in data.columns:
+                values = pd.to_numeric(data[col], errors="coerce")
+
+                func = lambda: dtype if fits_dtype(values, dtype) else estimator_dtype
+
+                data[col] = values.astype(func())
+
+        return data
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
+
+
+def to_estimator_dtype(data):
+    """
+    Method Name :   to_estimator_dtype
+    Description :   This method is used for converting the data to the estimator dtype, for the estimators which
+                    need floating point input
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = to_estimator_dtype.__name__
+
+    try:
+        estimator_dtype = read_params()["dtypes"]["estimator"]
+
+        return data.astype(estimator_dtype)
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
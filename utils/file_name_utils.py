@@ -0,0 +1,79 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+@lru_cache(maxsize=16)
+def get_file_name_pattern(regex, LengthOfDateStampInFile, LengthOfTimeStampInFile):
+    """
+    Method Name :   get_file_name_pattern
+    Description :   This method is used for compiling the regex from the regex file and the date and time stamp
+                    lengths from the schema file into one pattern. The name group is set when the file name
+                    matches the regex, the date and time groups are set when the second and third "_" separated
+                    parts of the file name have the expected lengths
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = get_file_name_pattern.__name__
+
+    try:
+        date = rf"(?:(?P<date>[^_]{{{LengthOfDateStampInFile}}})(?=_)|[^_]*)"
+
+        time = rf"(?:(?P<time>[^_.]{{{LengthOfTimeStampInFile}}})(?=[_.]|$)|[^_.]*)"
+
+        return re.compile(rf"(?:(?=(?P<name>{regex}))|)(?:[^_]*_{date}_{time})?")
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
+
+
+def classify_file_names(
+    file_names, regex, LengthOfDateStampInFile, LengthOfTimeStampInFile
+):
+    """
+    Method Name :   classify_file_names
+    Description :   This method is used for validating all the file names in one pass with the compiled file
+                    name pattern
+    Output      :   (good, bad) tuple, good is a list of file names and bad is a list of (file name, reason) tuples
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = classify_file_names.__name__
+
+    try:
+        pattern = get_file_name_pattern(
+            regex, LengthOfDateStampInFile, LengthOfTimeStampInFile
+        )
+
+        names = pd.Series(list(file_names), dtype=object)
+
+        parts = names.str.extract(pattern)
+
+        reasons = np.select(
+            [parts["name"].isna(), parts["date"].isna(), parts["time"].isna()],
+            [
+                "file name does not match regex",
+                "invalid date stamp length",
+                "invalid time stamp length",
+            ],
+            default="",
+        )
+
+        is_good = reasons == ""
+
+        good = names[is_good].tolist()
+
+        bad = list(zip(names[~is_good].tolist(), reasons[~is_good].tolist()))
+
+        return good, bad
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
@@ -0,0 +1,31 @@
+import hashlib
+
+import pandas as pd
+
+
+def get_dataframe_hash(data):
+    """
+    Method Name :   get_dataframe_hash
+    Description :   This method is used for getting the sha256 digest of the dataframe content, the digest
+                    depends on the column names and values but not on the index
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = get_dataframe_hash.__name__
+
+    try:
+        digest = hashlib.sha256()
+
+        digest.update("\x1f".join(map(str, data.columns)).encode())
+
+        row_hashes = pd.util.hash_pandas_object(data, index=False)
+
+        digest.update(row_hashes.to_numpy().tobytes())
+
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
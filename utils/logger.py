@@ -1,11 +1,202 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
 from datetime import datetime
+from queue import Empty, Queue
+
 from phising.mongo_db_operations.mongo_operations import MongoDB_Operation
+from pymongo.errors import BulkWriteError
+from utils.read_params import read_params
 
+logger = logging.getLogger(__name__)
+
+
+class Log_Sink:
+    """
+    Description :   This class is used for buffering the log records in memory and writing them
+                    to MongoDB in batches, grouped by database and collection, from a background thread
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
 
-class App_Logger:
     def __init__(self):
+        self.config = read_params()
+
+        self.class_name = self.__class__.__name__
+
         self.mongo = MongoDB_Operation()
 
+        self.batch_size = self.config["log_sink"]["batch_size"]
+
+        self.flush_interval = self.config["log_sink"]["flush_interval"]
+
+        self.max_pending = self.config["log_sink"]["max_pending"]
+
+        self.records = Queue()
+
+        self.pending = defaultdict(list)
+
+        self.flush_lock = threading.Lock()
+
+        self.wake_event = threading.Event()
+
+        self.stop_event = threading.Event()
+
+        self.worker = threading.Thread(target=self.run, daemon=True)
+
+        self.worker.start()
+
+        atexit.register(self.close)
+
+    def put(self, db_name, collection_name, record):
+        """
+        Method Name :   put
+        Description :   This method is used for queuing a log record, waking the writer when the batch is full
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        self.records.put((db_name, collection_name, record))
+
+        if self.records.qsize() >= self.batch_size:
+            self.wake_event.set()
+
+    def flush(self):
+        """
+        Method Name :   flush
+        Description :   This method is used for writing all the queued log records with one insert_many
+                        call per database and collection. The records which failed to insert are kept and
+                        retried on the next flush, the duplicate key errors of records which were already
+                        written are treated as success, and at most max_pending records are kept per collection
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        method_name = self.flush.__name__
+
+        with self.flush_lock:
+            while True:
+                try:
+                    db_name, collection_name, record = self.records.get_nowait()
+
+                except Empty:
+                    break
+
+                self.pending[(db_name, collection_name)].append(record)
+
+            errors = []
+
+            for key, records in list(self.pending.items()):
+                db_name, collection_name = key
+
+                try:
+                    self.mongo.insert_records(
+                        db_name=db_name, collection_name=collection_name, data=records
+                    )
+
+                    del self.pending[key]
+
+                except BulkWriteError as e:
+                    failed = [
+                        records[err["index"]]
+                        for err in e.details["writeErrors"]
+                        if err["code"] != 11000
+                    ]
+
+                    if len(failed) == 0:
+                        del self.pending[key]
+
+                    else:
+                        self.pending[key] = failed
+
+                        errors.append(
+                            f"{len(failed)} records for {db_name}.{collection_name} : {str(e)}"
+                        )
+
+                except Exception as e:
+                    errors.append(
+                        f"{len(records)} records for {db_name}.{collection_name} : {str(e)}"
+                    )
+
+                if len(self.pending.get(key, [])) > self.max_pending:
+                    n_dropped = len(self.pending[key]) - self.max_pending
+
+                    self.pending[key] = self.pending[key][n_dropped:]
+
+                    logger.warning(
+                        f"Dropped {n_dropped} oldest log records for {db_name}.{collection_name}, pending records exceeded {self.max_pending}"
+                    )
+
+        if errors:
+            raise Exception(
+                f"Exception occured in Class : {self.class_name}, Method : {method_name}, Error : Failed to write {', '.join(errors)}"
+            )
+
+    def run(self):
+        """
+        Method Name :   run
+        Description :   This method is used for flushing the queued log records on size or time threshold,
+                        until the sink is closed
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        while not self.stop_event.is_set():
+            self.wake_event.wait(timeout=self.flush_interval)
+
+            self.wake_event.clear()
+
+            try:
+                self.flush()
+
+            except Exception as e:
+                logger.error(str(e))
+
+    def close(self):
+        """
+        Method Name :   close
+        Description :   This method is used for stopping the background writer and flushing the remaining log records
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        self.stop_event.set()
+
+        self.wake_event.set()
+
+        self.worker.join(timeout=self.flush_interval)
+
+        self.flush()
+
+
+_log_sink = None
+
+_log_sink_lock = threading.Lock()
+
+
+def get_log_sink():
+    """
+    Method Name :   get_log_sink
+    Description :   This method is used for getting the process wide log sink, creating it on first use
+
+    Version     :   1.2
+    Revisions   :   moved setup to cloud
+    """
+    global _log_sink
+
+    with _log_sink_lock:
+        if _log_sink is None:
+            _log_sink = Log_Sink()
+
+        return _log_sink
+
+
+class App_Logger:
+    def __init__(self):
+        self.sink = get_log_sink()
+
         self.class_name = self.__class__.__name__
 
     def log(self, db_name, collection_name, log_info):
@@ -16,13 +207,21 @@ class App_Logger:
                 "Log_Info": log_info,
             }
 
-            self.mongo.insert_record(
-                db_name=db_name, collection_name=collection_name, data=log
-            )
+            self.sink.put(db_name=db_name, collection_name=collection_name, record=log)
 
         except Exception as e:
             raise e
 
+    def flush(self):
+        """
+        Method Name :   flush
+        Description :   This method is used for writing all the buffered log records to MongoDB
+
+        Version     :   1.2
+        Revisions   :   moved setup to cloud
+        """
+        self.sink.flush()
+
     def start_log(self, key, class_name, method_name, db_name, collection_name):
         """
         Method Name :   start_log
@@ -49,7 +248,7 @@ class App_Logger:
     def exception_log(self, error, class_name, method_name, db_name, collection_name):
         """
         Method Name :   exception_log
-        Description :   This method is used for logging exception
+        Description :   This method is used for logging exception, the buffered logs are flushed before raising
         Version     :   1.2
         Revisions   :   moved setup to cloud
         """
@@ -68,4 +267,10 @@ class App_Logger:
             db_name=db_name, collection_name=collection_name, log_info=exception_msg
         )
 
+        try:
+            self.flush()
+
+        except Exception as e:
+            logger.error(str(e))
+
         raise Exception(exception_msg)
@@ -1,10 +1,65 @@
+import os
+import threading
+from types import MappingProxyType
+
 import yaml
 
+_params_cache = {}
+
+_params_lock = threading.Lock()
+
+
+def freeze_params(value):
+    """
+    Method Name :   freeze_params
+    Description :   This method is used for converting the loaded yaml content to read only mappings and tuples
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze_params(v) for k, v in value.items()})
+
+    if isinstance(value, list):
+        return tuple(freeze_params(v) for v in value)
+
+    return value
+
+
+def reload_params(config_path="params.yaml"):
+    """
+    Method Name :   reload_params
+    Description :   This method is used for re-reading the params from yaml file and replacing the cached copy
+
+    Version     :   1.2
+    Revisions   :   Moved to setup to cloud
+    """
+    method_name = reload_params.__name__
+
+    try:
+        path = os.path.abspath(config_path)
+
+        mtime = os.stat(path).st_mtime_ns
+
+        with open(path) as f:
+            config = freeze_params(yaml.safe_load(f))
+
+        with _params_lock:
+            _params_cache[path] = (mtime, config)
+
+        return config
+
+    except Exception as e:
+        raise Exception(
+            f"Exception occured in {__file__}, Method : {method_name}, Error : {str(e)}"
+        )
+
 
 def read_params(config_path="params.yaml"):
     """
     Method Name :   read_params
-    Description :   This method is used for read the params from yaml file
+    Description :   This method is used for read the params from yaml file, the parsed params are cached
+                    and only re-read when the modification time of the file changes
 
     Version     :   1.2
     Revisions   :   Moved to setup to cloud
@@ -12,10 +67,14 @@ def read_params(config_path="params.yaml"):
     method_name = read_params.__name__
 
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        path = os.path.abspath(config_path)
 
-        return config
+        cached = _params_cache.get(path)
+
+        if cached is not None and cached[0] == os.stat(path).st_mtime_ns:
+            return cached[1]
+
+        return reload_params(config_path=path)
 
     except Exception as e:
         raise Exception(